@@ -1,35 +1,28 @@
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-try:
-    nltk.data.find('corpora/maxent_ne_chunker')
-except LookupError:
-    nltk.download('maxent_ne_chunker')
-try:
-    nltk.data.find('corpora/vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
-
 import nltk
 from textblob import TextBlob
 import re
 from collections import defaultdict
 from typing import List, Dict
 import random
+from functools import lru_cache
+
+# NLTK data is resolved lazily from the local data path (point NLTK_DATA at an
+# offline cache); nothing is probed or downloaded at import time.
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger'
+}
+
+@lru_cache(maxsize=None)
+def require_nltk(name: str) -> None:
+    """Check once per process that an NLTK resource is installed"""
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        raise LookupError(
+            f"NLTK resource '{name}' is not installed; "
+            f"run `python -m nltk.downloader -d $NLTK_DATA {name}`"
+        ) from None
 
 class ViralContentGenerator:
     def __init__(self):
@@ -208,6 +201,8 @@ class ViralContentGenerator:
     def generate_hashtag_groups(self, industry: str, content: str) -> Dict[str, List[str]]:
         """Generate grouped hashtags for the content"""
         # Extract keywords
+        require_nltk('punkt')
+        require_nltk('averaged_perceptron_tagger')
         words = nltk.word_tokenize(content.lower())
         keywords = [word for word, tag in nltk.pos_tag(words) 
                    if tag in ['NN', 'NNS', 'JJ', 'VB']]
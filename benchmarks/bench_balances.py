@@ -0,0 +1,90 @@
+"""
+Balance, settle-up and history reads against a large expense history.
+
+Seeds an in-memory SQLite database with users and expenses through the same
+write path as /add_expense (shares and ledger included), then compares the
+O(users) ledger endpoints with the O(expenses) scan they replace and times
+keyset-paginated history for a user who takes part in every expense:
+
+    python benchmarks/bench_balances.py --users 1000 --expenses 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import app, db, User, Expense, Balance, expense_shares, split_evenly, write_expenses  # noqa: E402
+
+BATCH_SIZE = 10_000
+
+
+def seed(users: int, expenses: int, max_participants: int) -> None:
+    """Insert users and expenses, keeping shares and the ledger in step batch by batch"""
+    db.create_all()
+    db.session.execute(User.__table__.insert(), [{'username': f'user{i}'} for i in range(1, users + 1)])
+    db.session.execute(Balance.__table__.insert(), [{'user_id': i, 'amount_cents': 0} for i in range(1, users + 1)])
+
+    rng = random.Random(0)
+    user_ids = list(range(1, users + 1))
+    for start in range(0, expenses, BATCH_SIZE):
+        parsed = []
+        for _ in range(min(BATCH_SIZE, expenses - start)):
+            payer = rng.choice(user_ids)
+            amount_cents = rng.randint(100, 20_000)
+            # User 1 joins every expense so its history is as long as the whole table
+            participants = list({1, *rng.sample(user_ids, rng.randint(1, max_participants))})
+            params = {'amount': amount_cents / 100, 'description': 'bench', 'user_id': payer, 'group_id': None}
+            parsed.append((params, expense_shares(payer, amount_cents, split_evenly(amount_cents, participants))))
+        write_expenses(parsed)
+        db.session.commit()
+
+
+def time_call(fn, runs: int) -> float:
+    """Median milliseconds per call"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Balance/settle-up benchmark")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--expenses', type=int, default=1_000_000)
+    parser.add_argument('--max-participants', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--deep-pages', type=int, default=100)
+    args = parser.parse_args()
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    with app.app_context():
+        start = time.perf_counter()
+        seed(args.users, args.expenses, args.max_participants)
+        print(f"seeded {args.expenses} expenses for {args.users} users in {time.perf_counter() - start:.1f}s")
+
+        client = app.test_client()
+        cursor = None
+        for _ in range(args.deep_pages):
+            cursor = client.get('/users/1/expenses', query_string={'cursor': cursor} if cursor else {}).json['next_cursor']
+        scan = db.select([Expense.user_id, db.func.sum(Expense.amount)]).group_by(Expense.user_id)
+        results = {
+            'GET /balances (ledger)': time_call(lambda: client.get('/balances'), args.runs),
+            'GET /settle_up (ledger + heaps)': time_call(lambda: client.get('/settle_up'), args.runs),
+            'GET /users/1/expenses (first page)': time_call(lambda: client.get('/users/1/expenses'), args.runs),
+            f'GET /users/1/expenses (page {args.deep_pages + 1})': time_call(
+                lambda: client.get('/users/1/expenses', query_string={'cursor': cursor}), args.runs
+            ),
+            'full expense scan (baseline)': time_call(lambda: db.session.execute(scan).fetchall(), args.runs),
+        }
+        for name, ms in results.items():
+            print(f"{name:>38}: {ms:9.2f} ms")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,64 @@
+"""
+Cold-start benchmark for the FloPro module and the Social Workflow Pro API.
+
+Each target is imported (and its generators constructed) in a fresh
+interpreter so every run pays the full cold-start cost:
+
+    python benchmarks/cold_start.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "social-workflow-pro")
+
+TARGETS = {
+    "FloPro": (
+        ROOT,
+        "import FloPro; FloPro.ViralContentGenerator()",
+    ),
+    "api": (
+        API_DIR,
+        "import app.main",
+    ),
+    "services": (
+        API_DIR,
+        "from app.services.viral_content_generator import ViralContentGenerator; "
+        "from app.services.trend_analyzer import TrendAnalyzer; "
+        "from app.services.market_analyzer import MarketAnalyzer; "
+        "ViralContentGenerator(); TrendAnalyzer(); MarketAnalyzer()",
+    ),
+}
+
+
+def time_cold_start(cwd: str, code: str, runs: int) -> list:
+    """Wall-clock seconds for `runs` fresh interpreters executing `code`"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("targets", nargs="*", default=list(TARGETS))
+    args = parser.parse_args()
+
+    for name in args.targets:
+        cwd, code = TARGETS[name]
+        timings = time_cold_start(cwd, code, args.runs)
+        print(
+            f"{name:>10}: median {statistics.median(timings) * 1000:8.1f} ms  "
+            f"min {min(timings) * 1000:8.1f} ms  ({args.runs} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Bulk idea generation for FloPro.
+
+Reads a JSONL job list, one job per line:
+
+    {"id": "pizza-1", "industry": "restaurant", "topic": "pizza", "hook_type": "value", "seed": 7}
+
+and fans the jobs out over a process pool in which every worker keeps one
+warm ViralContentGenerator. Results are appended to the output JSONL as they
+complete, so an interrupted run can be resumed with the same command: jobs
+whose id already has a result in the output file are skipped, and failures
+recorded by earlier runs are dropped from the file and retried. A malformed
+input line is recorded as a failed job (its id is the line number) rather
+than stopping the run.
+
+    python flopro_batch.py jobs.jsonl ideas.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, Set
+
+_generator = None
+
+
+def _init_worker() -> None:
+    """Build one generator per worker process and reuse it for every job"""
+    global _generator
+    from FloPro import ViralContentGenerator
+
+    _generator = ViralContentGenerator()
+
+
+def _run_job(job: Dict) -> Dict:
+    """Generate ideas for one job inside a worker"""
+    result = {key: job.get(key) for key in ('id', 'industry', 'topic', 'hook_type', 'seed')}
+    if 'invalid' in job:
+        result['error'] = job['invalid']
+        return result
+    try:
+        # Jobs run one at a time per worker, so seeding here makes them reproducible
+        if job.get('seed') is not None:
+            random.seed(job['seed'])
+        result['ideas'] = _generator.generate_viral_content(
+            job['industry'], job['topic'], job['hook_type']
+        )
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def completed_job_ids(output_path: str) -> Set[str]:
+    """
+    Ids that already have a successful result in the output file.
+
+    Failed results and partial lines from an interrupted run are removed
+    from the file, so the retried jobs are recorded once rather than again
+    on every run.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    kept, rewrite = [], False
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict) and 'ideas' in record and line.endswith('\n'):
+                done.add(record['id'])
+                kept.append(line)
+            elif line.strip():
+                # A failure, or a line cut short by an interrupted run
+                rewrite = True
+
+    if rewrite:
+        partial = output_path + '.tmp'
+        with open(partial, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+        os.replace(partial, output_path)
+    return done
+
+
+def read_jobs(input_path: str, skip: Set[str]) -> Iterator[Dict]:
+    """Stream jobs from the input file, giving each an id and dropping finished ones"""
+    with open(input_path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                job = {'invalid': f"invalid job on line {line_number}: {e}"}
+            if not isinstance(job, dict):
+                job = {'invalid': f"invalid job on line {line_number}: expected a JSON object"}
+            job['id'] = str(job.get('id', line_number))
+            if job['id'] not in skip:
+                yield job
+
+
+def run(input_path: str, output_path: str, workers: int, chunksize: int, report_every: int) -> Dict:
+    """Process every pending job and return throughput stats"""
+    done = completed_job_ids(output_path)
+
+    stats = {'skipped': len(done), 'completed': 0, 'failed': 0, 'ideas': 0}
+    start = time.perf_counter()
+
+    with open(output_path, 'a', encoding='utf-8') as out, \
+            Pool(workers, initializer=_init_worker) as pool:
+        for result in pool.imap_unordered(_run_job, read_jobs(input_path, done), chunksize):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+
+            if 'error' in result:
+                stats['failed'] += 1
+            else:
+                stats['completed'] += 1
+                stats['ideas'] += len(result['ideas'])
+
+            processed = stats['completed'] + stats['failed']
+            if report_every and processed % report_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{processed} jobs, {stats['ideas']} ideas, "
+                      f"{processed / elapsed:.1f} jobs/s", file=sys.stderr)
+
+    stats['seconds'] = time.perf_counter() - start
+    processed = stats['completed'] + stats['failed']
+    stats['jobs_per_second'] = processed / stats['seconds'] if stats['seconds'] else 0.0
+    stats['ideas_per_second'] = stats['ideas'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk idea generation for FloPro")
+    parser.add_argument('input', help="JSONL file of {industry, topic, hook_type[, id, seed]} jobs")
+    parser.add_argument('output', help="JSONL file results are appended to")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--report-every', type=int, default=1000)
+    args = parser.parse_args()
+
+    stats = run(args.input, args.output, args.workers, args.chunksize, args.report_every)
+    print(
+        f"completed {stats['completed']}, failed {stats['failed']}, "
+        f"skipped {stats['skipped']} in {stats['seconds']:.1f}s "
+        f"({stats['jobs_per_second']:.1f} jobs/s, {stats['ideas_per_second']:.0f} ideas/s)",
+        file=sys.stderr
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,14 @@
+import base64
+import csv
+import heapq
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.schema import CreateIndex
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///splitwise.db'
@@ -13,11 +21,396 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     expenses = db.relationship('Expense', backref='owner', lazy=True)
 
+class Group(db.Model):
+    __tablename__ = 'expense_group'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+
+class GroupMember(db.Model):
+    group_id = db.Column(db.Integer, db.ForeignKey('expense_group.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, index=True)
+
 class Expense(db.Model):
+    __table_args__ = (db.Index('ix_expense_group_history', 'group_id', 'created_at', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
     description = db.Column(db.String(200), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    group_id = db.Column(db.Integer, db.ForeignKey('expense_group.id'))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class ExpenseShare(db.Model):
+    """One user's side of an expense: what they paid and what they owe.
+    Denormalizes created_at so per-user history is a single index range scan."""
+    __table_args__ = (db.Index('ix_expense_share_history', 'user_id', 'created_at', 'expense_id'),)
+    expense_id = db.Column(db.Integer, db.ForeignKey('expense.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    paid_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    share_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+class Balance(db.Model):
+    """Net position per user, kept up to date in the same transaction as each expense.
+    Positive means the user is owed money, negative means they owe."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    amount_cents = db.Column(db.BigInteger, nullable=False, default=0)
+
+# Ledger
+_apply_delta = Balance.__table__.update().where(
+    Balance.user_id == bindparam('b_user_id')
+).values(amount_cents=Balance.amount_cents + bindparam('b_delta'))
+
+# Largest amount whose cents survive the float amount column exactly
+MAX_AMOUNT = Decimal(2 ** 53) / 100
+
+def to_cents(amount) -> int:
+    """Parse a positive money amount into integer cents"""
+    try:
+        value = Decimal(str(amount))
+    except (InvalidOperation, ValueError):
+        raise ValueError('amount must be a number')
+    if not value.is_finite():
+        raise ValueError('amount must be a finite number')
+    if value > MAX_AMOUNT:
+        raise ValueError('amount is too large')
+    cents = int((value * 100).to_integral_value())
+    if cents <= 0:
+        raise ValueError('amount must be positive')
+    return cents
+
+def parse_id(value, name: str) -> int:
+    """Accept an integer id, or its decimal digits as CSV delivers them"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise ValueError(f'{name} must be an integer')
+
+def split_evenly(amount_cents: int, participant_ids: list) -> dict:
+    """Split an amount across participants; leftover cents go to the first ones"""
+    share, remainder = divmod(amount_cents, len(participant_ids))
+    return {
+        user_id: share + (1 if i < remainder else 0)
+        for i, user_id in enumerate(participant_ids)
+    }
+
+def parse_shares(raw: dict, amount_cents: int) -> dict:
+    """Validate an explicit {user_id: amount} split that must add up to the expense"""
+    if not isinstance(raw, dict):
+        raise ValueError('shares must map user ids to amounts')
+    split = {parse_id(user_id, 'shares user id'): to_cents(amount) for user_id, amount in raw.items()}
+    if sum(split.values()) != amount_cents:
+        raise ValueError('shares must add up to amount')
+    return split
+
+def expense_shares(payer_id: int, amount_cents: int, split: dict) -> dict:
+    """Per-user (paid, owed) cents for one expense; the payer always gets a row"""
+    shares = {user_id: (0, share) for user_id, share in split.items()}
+    shares[payer_id] = (amount_cents, shares.get(payer_id, (0, 0))[1])
+    return shares
+
+def apply_deltas(deltas: dict) -> None:
+    """Add ledger deltas inside the current transaction"""
+    db.session.execute(_apply_delta, [
+        {'b_user_id': user_id, 'b_delta': delta}
+        for user_id, delta in deltas.items() if delta
+    ])
+
+def simplify_debts(balances: dict) -> list:
+    """
+    Turn net balances into transfers by repeatedly settling the largest
+    debtor against the largest creditor (two heaps). Needs at most n-1
+    transfers for n users with a non-zero balance.
+    """
+    creditors = [(-amount, user_id) for user_id, amount in balances.items() if amount > 0]
+    debtors = [(amount, user_id) for user_id, amount in balances.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+
+    return transfers
+
+# Expenses
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+class ExpenseContext:
+    """
+    Users and group memberships that incoming expenses are validated against.
+    Only the ids an expense references are looked up, and remembered for the
+    rest of the context; imports pass `preload_users` to read the user table once.
+    """
+
+    def __init__(self, preload_users: bool = False):
+        self._known_user_ids = set()
+        self._all_user_ids = None
+        self._groups = {}
+        if preload_users:
+            self.all_user_ids()
+
+    def all_user_ids(self) -> list:
+        """Every user id, for expenses explicitly split between all users"""
+        if self._all_user_ids is None:
+            self._all_user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+            self._known_user_ids.update(self._all_user_ids)
+        return self._all_user_ids
+
+    def users_exist(self, user_ids) -> bool:
+        missing = set(user_ids) - self._known_user_ids
+        if missing and self._all_user_ids is None:
+            self._known_user_ids.update(
+                user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(missing))
+            )
+            missing -= self._known_user_ids
+        return not missing
+
+    def members(self, group_id: int) -> list:
+        """Member ids of a group, loaded once per context"""
+        if group_id not in self._groups:
+            if Group.query.get(group_id) is None:
+                raise ValueError('Unknown group')
+            self._groups[group_id] = [user_id for (user_id,) in db.session.query(GroupMember.user_id).filter(
+                GroupMember.group_id == group_id
+            ).order_by(GroupMember.user_id)]
+        return self._groups[group_id]
+
+def parse_expense_row(row: dict, context: ExpenseContext) -> tuple:
+    """Validate one expense, returning (insert params, {user_id: (paid cents, owed cents)})"""
+    if row.get('user_id') is None or row.get('description') is None:
+        raise ValueError('user_id and description are required')
+    payer = parse_id(row['user_id'], 'user_id')
+    description = row['description']
+    if not isinstance(description, str):
+        raise ValueError('description must be a string')
+    if not context.users_exist([payer]):
+        raise ValueError('Unknown user')
+    if not description or len(description) > 200:
+        raise ValueError('description must be 1-200 characters')
+    amount_cents = to_cents(row.get('amount'))
+
+    # Group expenses default to a split between the group's members; without a
+    # group the participants must be named, or "all" to split between every user
+    group_id = row.get('group_id')
+    members = None
+    if group_id not in (None, ''):
+        group_id = parse_id(group_id, 'group_id')
+        members = context.members(group_id)
+        if payer not in members:
+            raise ValueError('Payer is not a member of the group')
+    else:
+        group_id = None
+
+    if row.get('shares'):
+        split = parse_shares(row['shares'], amount_cents)
+    else:
+        participant_ids = row.get('participant_ids')
+        if isinstance(participant_ids, str) and participant_ids.strip().lower() == 'all':
+            participant_ids = members if members is not None else context.all_user_ids()
+        elif isinstance(participant_ids, str):
+            participant_ids = [p for p in participant_ids.split(';') if p.strip()]
+        if participant_ids:
+            participant_ids = list(dict.fromkeys(parse_id(p, 'participant id') for p in participant_ids))
+        elif members is not None:
+            participant_ids = members
+        else:
+            raise ValueError('participant_ids is required without a group_id ("all" splits between every user)')
+        split = split_evenly(amount_cents, participant_ids)
+
+    if members is not None:
+        if not set(members).issuperset(split):
+            raise ValueError('Participant is not a member of the group')
+    elif not context.users_exist(split):
+        raise ValueError('Unknown participant')
+
+    params = {'amount': amount_cents / 100, 'description': description, 'user_id': payer, 'group_id': group_id}
+    return params, expense_shares(payer, amount_cents, split)
+
+def write_expenses(parsed: list) -> list:
+    """
+    Insert parsed (params, shares) expenses with their share rows and ledger
+    deltas inside the current transaction, returning the new expense ids.
+
+    Expenses are inserted one statement each so every id is the one the
+    database assigned; share rows, which need those ids, go in with one
+    executemany.
+    """
+    created_at = datetime.utcnow()
+    insert_expense = Expense.__table__.insert()
+    expense_ids = [
+        db.session.execute(insert_expense, dict(params, created_at=created_at)).inserted_primary_key[0]
+        for params, _ in parsed
+    ]
+
+    share_rows, deltas = [], {}
+    for expense_id, (_, shares) in zip(expense_ids, parsed):
+        for user_id, (paid_cents, share_cents) in shares.items():
+            share_rows.append({
+                'expense_id': expense_id, 'user_id': user_id, 'created_at': created_at,
+                'paid_cents': paid_cents, 'share_cents': share_cents,
+            })
+            deltas[user_id] = deltas.get(user_id, 0) + paid_cents - share_cents
+    db.session.execute(ExpenseShare.__table__.insert(), share_rows)
+    apply_deltas(deltas)
+    return expense_ids
+
+def ingest_expenses(rows) -> dict:
+    """
+    Validate (line, row) pairs as they arrive and insert accepted rows in
+    batches. Each batch, including its shares and ledger deltas, is
+    committed as its own transaction.
+    """
+    context = ExpenseContext(preload_users=True)
+    report = {'accepted': 0, 'rejected': 0, 'errors': []}
+    batch = []
+
+    def flush():
+        write_expenses(batch)
+        db.session.commit()
+        report['accepted'] += len(batch)
+        batch.clear()
+
+    for line, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            batch.append(parse_expense_row(row, context))
+        except (ValueError, TypeError, AttributeError, OverflowError) as e:
+            report['rejected'] += 1
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append({'line': line, 'message': str(e)})
+            continue
+
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+
+    if batch:
+        flush()
+    return report
+
+def decode_lines(lines, invalid: set):
+    """Decode uploaded byte lines as UTF-8, adding the numbers of undecodable lines to `invalid`"""
+    for number, line in enumerate(lines, 1):
+        try:
+            yield line.decode('utf-8')
+        except UnicodeDecodeError:
+            invalid.add(number)
+            yield line.decode('utf-8', errors='replace')
+
+def read_ndjson(lines):
+    """(line number, row) pairs from NDJSON bytes, yielding parse errors in place of rows"""
+    invalid = set()
+    for number, line in enumerate(decode_lines(lines, invalid), 1):
+        if number in invalid:
+            yield number, ValueError('Line is not valid UTF-8')
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f'Invalid JSON: {e}')
+
+def read_csv(lines):
+    """(line number, row) pairs from CSV bytes with an amount,description,user_id[,participant_ids] header"""
+    invalid = set()
+    reader = csv.DictReader(decode_lines(lines, invalid))
+    last_line = 0
+    for row in reader:
+        # A quoted field can span lines; the row is bad if any of its lines is
+        if invalid.intersection(range(last_line + 1, reader.line_num + 1)):
+            yield reader.line_num, ValueError('Line is not valid UTF-8')
+        else:
+            yield reader.line_num, row
+        last_line = reader.line_num
+
+# History
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(created_at: datetime, expense_id: int) -> str:
+    """Opaque cursor pointing just past the given (created_at, id) row"""
+    raw = json.dumps([created_at.isoformat(), expense_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, expense_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(expense_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def page_args() -> tuple:
+    """(limit, decoded cursor or None) from the query string"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    cursor = request.args.get('cursor')
+    return limit, decode_cursor(cursor) if cursor else None
+
+def keyset_page(query, created_at_column, id_column, limit: int, after) -> tuple:
+    """
+    Newest-first page of `query` seeking past `after` on a (created_at, id)
+    index, so deep pages cost the same as the first. Returns (rows, next cursor).
+    """
+    if after is not None:
+        created_at, expense_id = after
+        query = query.filter(or_(
+            created_at_column < created_at,
+            and_(created_at_column == created_at, id_column < expense_id),
+        ))
+    rows = query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def init_db():
+    """Create tables, migrate older expense tables and give every existing user a ledger row"""
+    db.create_all()
+    _migrate_expenses()
+    # Users without a ledger row predate the ledger: open it at what their
+    # (possibly just backfilled) shares add up to. Existing rows already count
+    # every expense recorded since the ledger was introduced.
+    net_cents = db.func.coalesce(db.func.sum(ExpenseShare.paid_cents - ExpenseShare.share_cents), 0)
+    missing = db.select([User.id, net_cents]).select_from(
+        User.__table__.outerjoin(ExpenseShare.__table__, ExpenseShare.user_id == User.id)
+    ).where(~User.id.in_(db.select([Balance.user_id]))).group_by(User.id)
+    db.session.execute(Balance.__table__.insert().from_select(['user_id', 'amount_cents'], missing))
+    db.session.commit()
+
+def _migrate_expenses():
+    """Bring an expense table created before groups and shares up to date"""
+    columns = {row[1] for row in db.session.execute(db.text('PRAGMA table_info(expense)'))}
+    if 'group_id' not in columns:
+        db.session.execute(db.text('ALTER TABLE expense ADD COLUMN group_id INTEGER REFERENCES expense_group (id)'))
+    if 'created_at' not in columns:
+        db.session.execute(db.text('ALTER TABLE expense ADD COLUMN created_at DATETIME'))
+        # Same text format SQLAlchemy writes, so cursor comparisons line up with new rows
+        db.session.execute(db.text("UPDATE expense SET created_at = strftime('%Y-%m-%d %H:%M:%S.000000', 'now')"))
+        # Older expenses were never split, so they only have the payer's side
+        payer_rows = db.select([
+            Expense.id, Expense.user_id, db.cast(db.func.round(Expense.amount * 100), db.BigInteger),
+            db.literal(0), Expense.created_at,
+        ]).where(~Expense.id.in_(db.select([ExpenseShare.expense_id])))
+        db.session.execute(ExpenseShare.__table__.insert().from_select(
+            ['expense_id', 'user_id', 'paid_cents', 'share_cents', 'created_at'], payer_rows
+        ))
+    for index in Expense.__table__.indexes:
+        db.session.execute(CreateIndex(index, if_not_exists=True))
 
 # Routes
 @app.route('/register', methods=['POST'])
@@ -25,17 +418,173 @@ def register():
     data = request.get_json()
     new_user = User(username=data['username'])
     db.session.add(new_user)
+    db.session.flush()
+    db.session.add(Balance(user_id=new_user.id, amount_cents=0))
     db.session.commit()
     return jsonify({'message': 'User registered successfully!'}), 201
 
 @app.route('/add_expense', methods=['POST'])
 def add_expense():
+    # Split by explicit shares, or evenly between participants (the group or everyone by default)
+    try:
+        parsed = parse_expense_row(request.get_json(), ExpenseContext())
+    except (ValueError, TypeError, AttributeError, OverflowError) as e:
+        return jsonify({'message': str(e)}), 400
+    expense_id, = write_expenses([parsed])
+    db.session.commit()
+    return jsonify({'message': 'Expense added successfully!', 'expense_id': expense_id}), 201
+
+@app.route('/expenses/bulk', methods=['POST'])
+def add_expenses_bulk():
     data = request.get_json()
-    new_expense = Expense(amount=data['amount'], description=data['description'], user_id=data['user_id'])
-    db.session.add(new_expense)
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a JSON array of expenses'}), 400
+    return jsonify(ingest_expenses(enumerate(data))), 201
+
+@app.route('/expenses/import', methods=['POST'])
+def import_expenses():
+    # Read the upload line by line so rows are validated as they stream in
+    if request.mimetype == 'text/csv':
+        rows = read_csv(request.stream)
+    elif request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        rows = read_ndjson(request.stream)
+    else:
+        return jsonify({'message': 'Upload text/csv or application/x-ndjson'}), 415
+    return jsonify(ingest_expenses(rows)), 201
+
+@app.route('/balances', methods=['GET'])
+def get_balances():
+    rows = db.session.query(User.id, User.username, Balance.amount_cents).join(
+        Balance, Balance.user_id == User.id
+    ).order_by(User.id)
+    return jsonify([
+        {'user_id': user_id, 'username': username, 'balance': amount_cents / 100}
+        for user_id, username, amount_cents in rows
+    ])
+
+@app.route('/balances/<int:user_id>', methods=['GET'])
+def get_balance(user_id):
+    balance = Balance.query.get(user_id)
+    if balance is None:
+        return jsonify({'message': 'Unknown user'}), 404
+    return jsonify({'user_id': user_id, 'balance': balance.amount_cents / 100})
+
+@app.route('/settle_up', methods=['GET'])
+def settle_up():
+    balances = dict(db.session.query(Balance.user_id, Balance.amount_cents).filter(Balance.amount_cents != 0))
+    return jsonify({'transfers': [
+        {'from_user_id': debtor, 'to_user_id': creditor, 'amount': amount / 100}
+        for debtor, creditor, amount in simplify_debts(balances)
+    ]})
+
+@app.route('/groups', methods=['POST'])
+def create_group():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Expected a JSON object'}), 400
+    name = data.get('name')
+    if not isinstance(name, str) or not name or len(name) > 80:
+        return jsonify({'message': 'name must be 1-80 characters'}), 400
+    member_ids = data.get('member_ids', [])
+    if not isinstance(member_ids, list) or not all(isinstance(m, int) and not isinstance(m, bool) for m in member_ids):
+        return jsonify({'message': 'member_ids must be a list of user ids'}), 400
+    member_ids = list(dict.fromkeys(member_ids))
+    known = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(member_ids))}
+    if len(known) != len(member_ids):
+        return jsonify({'message': 'Unknown user'}), 400
+
+    group = Group(name=name)
+    db.session.add(group)
+    db.session.flush()
+    if member_ids:
+        db.session.execute(GroupMember.__table__.insert(), [
+            {'group_id': group.id, 'user_id': user_id} for user_id in member_ids
+        ])
     db.session.commit()
-    return jsonify({'message': 'Expense added successfully!'}), 201
+    return jsonify({'group_id': group.id, 'name': group.name, 'member_ids': sorted(member_ids)}), 201
+
+@app.route('/groups/<int:group_id>/members', methods=['POST'])
+def add_group_members(group_id):
+    if Group.query.get(group_id) is None:
+        return jsonify({'message': 'Unknown group'}), 404
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Expected a JSON object'}), 400
+    user_ids = data.get('user_ids', [])
+    if not isinstance(user_ids, list) or not all(isinstance(u, int) and not isinstance(u, bool) for u in user_ids):
+        return jsonify({'message': 'user_ids must be a list of user ids'}), 400
+    user_ids = set(user_ids)
+    known = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+    if known != user_ids:
+        return jsonify({'message': 'Unknown user'}), 400
+
+    existing = {user_id for (user_id,) in db.session.query(GroupMember.user_id).filter(
+        GroupMember.group_id == group_id, GroupMember.user_id.in_(user_ids)
+    )}
+    if user_ids - existing:
+        db.session.execute(GroupMember.__table__.insert(), [
+            {'group_id': group_id, 'user_id': user_id} for user_id in sorted(user_ids - existing)
+        ])
+    db.session.commit()
+    member_ids = [user_id for (user_id,) in db.session.query(GroupMember.user_id).filter(
+        GroupMember.group_id == group_id
+    ).order_by(GroupMember.user_id)]
+    return jsonify({'group_id': group_id, 'member_ids': member_ids})
+
+@app.route('/users/<int:user_id>/expenses', methods=['GET'])
+def user_expenses(user_id):
+    if User.query.get(user_id) is None:
+        return jsonify({'message': 'Unknown user'}), 404
+    try:
+        limit, after = page_args()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    # Walks the (user_id, created_at, expense_id) share index, joining each hit by primary key
+    query = db.session.query(
+        ExpenseShare.expense_id.label('id'), ExpenseShare.created_at, ExpenseShare.paid_cents,
+        ExpenseShare.share_cents, Expense.description, Expense.amount, Expense.user_id, Expense.group_id,
+    ).join(Expense, Expense.id == ExpenseShare.expense_id).filter(ExpenseShare.user_id == user_id)
+    rows, next_cursor = keyset_page(query, ExpenseShare.created_at, ExpenseShare.expense_id, limit, after)
+    return jsonify({
+        'expenses': [{
+            'expense_id': row.id, 'description': row.description, 'amount': row.amount,
+            'paid_by': row.user_id, 'group_id': row.group_id, 'created_at': row.created_at.isoformat(),
+            'paid': row.paid_cents / 100, 'share': row.share_cents / 100,
+            'net': (row.paid_cents - row.share_cents) / 100,
+        } for row in rows],
+        'next_cursor': next_cursor,
+    })
+
+@app.route('/groups/<int:group_id>/expenses', methods=['GET'])
+def group_expenses(group_id):
+    if Group.query.get(group_id) is None:
+        return jsonify({'message': 'Unknown group'}), 404
+    try:
+        limit, after = page_args()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = db.session.query(
+        Expense.id, Expense.created_at, Expense.description, Expense.amount, Expense.user_id
+    ).filter(Expense.group_id == group_id)
+    rows, next_cursor = keyset_page(query, Expense.created_at, Expense.id, limit, after)
+    shares = {}
+    if rows:
+        for expense_id, user_id, share_cents in db.session.query(
+            ExpenseShare.expense_id, ExpenseShare.user_id, ExpenseShare.share_cents
+        ).filter(ExpenseShare.expense_id.in_([row.id for row in rows])):
+            if share_cents:
+                shares.setdefault(expense_id, {})[str(user_id)] = share_cents / 100
+    return jsonify({
+        'expenses': [{
+            'expense_id': row.id, 'description': row.description, 'amount': row.amount,
+            'paid_by': row.user_id, 'created_at': row.created_at.isoformat(),
+            'shares': shares.get(row.id, {}),
+        } for row in rows],
+        'next_cursor': next_cursor,
+    })
 
 if __name__ == '__main__':
-    db.create_all()  # Create database tables
+    init_db()  # Create database tables
     app.run(debug=True)
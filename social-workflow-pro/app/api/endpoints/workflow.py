@@ -1,56 +1,208 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ...db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+import orjson
+from ...db.session import AsyncSessionLocal, get_async_db
+from ...models.workflow import Campaign
 from ...schemas.workflow import (
     WorkflowCreate,
+    WorkflowBulkCreate,
+    WorkflowBulkResult,
     WorkflowUpdate,
     WorkflowInDB,
     CampaignCreate,
-    CampaignInDB
+    CampaignUpdate,
+    CampaignInDB,
+    WorkflowInclusion,
+    PublishAttemptInDB,
+    DeadLetterReplay,
+    DeadLetterReplayResult,
+    fieldset_model
 )
 from ...services.workflow_service import WorkflowService, CampaignService
+from ...utils.content_analyzer import analysis_cache_stats
+from ...utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...utils.response_cache import CachedResponse, response_cache
 
 router = APIRouter()
 
+# Listings are keyset paginated: the cursor for the next page comes back in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+def row_page_response(rows: List[dict], next_cursor: Optional[str]) -> Response:
+    response = ORJSONResponse(rows)
+    set_next_cursor(response, next_cursor)
+    return response
+
+def etag_response(request: Request, cached: CachedResponse) -> Response:
+    """The cached body, or a bodiless 304 when the client already holds this ETag"""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if cached.etag in tags or "*" in tags:
+            response_cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+WORKFLOW_FIELDS = tuple(WorkflowInDB.model_fields)
+# Campaign fields read straight off the row when nested workflows are left out
+CAMPAIGN_NESTED = ("workflows", "workflow_counts")
+CAMPAIGN_COLUMNS = tuple(name for name in CampaignInDB.model_fields if name not in CAMPAIGN_NESTED)
+
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return; the id is always included")
+INCLUDE_WORKFLOWS_QUERY = Query(
+    None, description="Nested workflows: full, summary (counts by status) or none. Defaults to summary with `fields`, else full"
+)
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """A sparse fieldset in response order, id included, or None for every field"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name in requested or name == "id")
+
+def workflow_inclusion(include: Optional[WorkflowInclusion], fields: Optional[Tuple[str, ...]]) -> WorkflowInclusion:
+    """
+    `fields` does not reach into nested workflows, so a sparse campaign read
+    only loads them in full when asked to explicitly
+    """
+    if include is not None:
+        return include
+    return WorkflowInclusion.SUMMARY if fields else WorkflowInclusion.FULL
+
+async def shape_campaigns(
+    db: AsyncSession,
+    campaigns: List[Campaign],
+    include: WorkflowInclusion,
+    fields: Optional[Tuple[str, ...]] = None
+) -> list:
+    """
+    Campaign responses carrying only the requested fields and workflow detail.
+    They are serialized excluding unset fields, so `workflows` or
+    `workflow_counts` is omitted rather than sent as null.
+    """
+    if include == WorkflowInclusion.FULL and not fields:
+        return campaigns
+    counts = {}
+    if include == WorkflowInclusion.SUMMARY:
+        counts = await CampaignService.get_workflow_counts(db, [campaign.id for campaign in campaigns])
+
+    model = fieldset_model(CampaignInDB, fields + CAMPAIGN_NESTED) if fields else CampaignInDB
+    shaped = []
+    for campaign in campaigns:
+        values = {name: getattr(campaign, name) for name in fields or CAMPAIGN_COLUMNS}
+        if include == WorkflowInclusion.FULL:
+            values["workflows"] = campaign.workflows
+        elif include == WorkflowInclusion.SUMMARY:
+            values["workflow_counts"] = counts[campaign.id]
+        shaped.append(model(**values))
+    return shaped
+
+def campaign_json(campaign) -> bytes:
+    if isinstance(campaign, Campaign):
+        campaign = CampaignInDB.model_validate(campaign)
+    return campaign.model_dump_json(exclude_unset=True).encode()
+
 @router.post("/workflows/", response_model=WorkflowInDB)
 async def create_workflow(
     workflow: WorkflowCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new workflow"""
     return await WorkflowService.create_workflow(db, workflow)
 
+@router.post("/workflows/bulk", response_model=WorkflowBulkResult)
+async def create_workflows_bulk(
+    bulk: WorkflowBulkCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many workflows in one transaction, reporting a result per item"""
+    results = await WorkflowService.create_workflows(db, bulk.workflows)
+    rejected = sum(1 for item in results if item.id is None)
+    return WorkflowBulkResult(created=len(results) - rejected, rejected=rejected, results=results)
+
+@router.get("/workflows/export", response_class=StreamingResponse)
+async def export_workflows(
+    campaign_id: Optional[int] = None,
+    status: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY
+):
+    """Stream every matching workflow as NDJSON, one WorkflowInDB object per line, in id order"""
+    fieldset = parse_fields(fields, WORKFLOW_FIELDS)
+
+    async def lines() -> AsyncIterator[bytes]:
+        # Own session: the stream outlives the request handler
+        async with AsyncSessionLocal() as db:
+            async for rows in WorkflowService.stream_workflows(
+                db, campaign_id=campaign_id, status=status, fields=fieldset
+            ):
+                # Row keys are SQLAlchemy quoted_name strings, which orjson only takes with this option
+                yield b"".join(orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS) + b"\n" for row in rows)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/workflows/{workflow_id}", response_model=WorkflowInDB)
-def get_workflow(workflow_id: int, db: Session = Depends(get_db)):
-    """Get a specific workflow by ID"""
-    workflow = WorkflowService.get_workflow(db, workflow_id)
-    if workflow is None:
+async def get_workflow(
+    workflow_id: int,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific workflow by ID; supports If-None-Match"""
+    fieldset = parse_fields(fields, WORKFLOW_FIELDS)
+    version = await WorkflowService.get_workflow_version(db, workflow_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
-    return workflow
+    cached = response_cache.get("workflow", workflow_id, version, fieldset)
+    if cached is None:
+        row = await WorkflowService.get_workflow_row(db, workflow_id, fieldset)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        model = fieldset_model(WorkflowInDB, fieldset) if fieldset else WorkflowInDB
+        body = model.model_validate(row).model_dump_json().encode()
+        cached = response_cache.put("workflow", workflow_id, version, body, fieldset)
+    return etag_response(request, cached)
 
 @router.get("/workflows/", response_model=List[WorkflowInDB])
-def get_workflows(
-    skip: int = 0,
-    limit: int = 100,
+async def get_workflows(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     campaign_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all workflows with optional filtering"""
-    return WorkflowService.get_workflows(
-        db,
-        skip=skip,
-        limit=limit,
-        campaign_id=campaign_id,
-        status=status
-    )
+    """
+    Get a page of workflows with optional filtering.
+    Rows are encoded with orjson straight from the query, skipping ORM loading and model validation.
+    """
+    try:
+        rows, next_cursor = await WorkflowService.get_workflow_rows(
+            db,
+            limit=limit,
+            cursor=cursor,
+            campaign_id=campaign_id,
+            status=status,
+            fields=parse_fields(fields, WORKFLOW_FIELDS)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return row_page_response(rows, next_cursor)
 
 @router.put("/workflows/{workflow_id}", response_model=WorkflowInDB)
 async def update_workflow(
     workflow_id: int,
     workflow_update: WorkflowUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a workflow"""
     workflow = await WorkflowService.update_workflow(db, workflow_id, workflow_update)
@@ -59,37 +211,129 @@ async def update_workflow(
     return workflow
 
 @router.delete("/workflows/{workflow_id}")
-def delete_workflow(workflow_id: int, db: Session = Depends(get_db)):
+async def delete_workflow(workflow_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a workflow"""
-    success = WorkflowService.delete_workflow(db, workflow_id)
+    success = await WorkflowService.delete_workflow(db, workflow_id)
     if not success:
         raise HTTPException(status_code=404, detail="Workflow not found")
     return {"message": "Workflow deleted successfully"}
 
-@router.post("/campaigns/", response_model=CampaignInDB)
-def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
+@router.get("/workflows/{workflow_id}/attempts", response_model=List[PublishAttemptInDB])
+async def get_publish_attempts(workflow_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Publish attempts for a workflow, oldest first"""
+    if await WorkflowService.get_workflow(db, workflow_id) is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return await WorkflowService.get_publish_attempts(db, workflow_id)
+
+@router.get("/dead-letters/", response_model=List[WorkflowInDB])
+async def get_dead_letters(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a page of workflows that exhausted their publish retries"""
+    try:
+        rows, next_cursor = await WorkflowService.get_workflow_rows(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status="dead_letter",
+            fields=parse_fields(fields, WORKFLOW_FIELDS)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return row_page_response(rows, next_cursor)
+
+@router.post("/dead-letters/replay", response_model=DeadLetterReplayResult)
+async def replay_dead_letters(replay: DeadLetterReplay, db: AsyncSession = Depends(get_async_db)):
+    """Queue dead-lettered workflows for publishing again"""
+    workflow_ids = await WorkflowService.replay_dead_letters(db, replay.workflow_ids)
+    return DeadLetterReplayResult(replayed=len(workflow_ids), workflow_ids=workflow_ids)
+
+@router.post("/campaigns/", response_model=CampaignInDB, response_model_exclude_unset=True)
+async def create_campaign(campaign: CampaignCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new campaign"""
-    return CampaignService.create_campaign(db, campaign)
+    return await CampaignService.create_campaign(db, campaign)
+
+@router.get("/campaigns/{campaign_id}", response_model=CampaignInDB, response_model_exclude_unset=True)
+async def get_campaign(
+    campaign_id: int,
+    request: Request,
+    include_workflows: Optional[WorkflowInclusion] = INCLUDE_WORKFLOWS_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific campaign by ID; supports If-None-Match"""
+    fieldset = parse_fields(fields, CAMPAIGN_COLUMNS)
+    include_workflows = workflow_inclusion(include_workflows, fieldset)
+    version = await CampaignService.get_campaign_version(db, campaign_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    variant = (include_workflows, fieldset)
+    cached = response_cache.get("campaign", campaign_id, version, variant)
+    if cached is None:
+        campaign = await CampaignService.get_campaign(
+            db,
+            campaign_id,
+            with_workflows=include_workflows == WorkflowInclusion.FULL,
+            fields=fieldset
+        )
+        if campaign is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        shaped, = await shape_campaigns(db, [campaign], include_workflows, fieldset)
+        cached = response_cache.put("campaign", campaign_id, version, campaign_json(shaped), variant)
+    return etag_response(request, cached)
 
-@router.get("/campaigns/{campaign_id}", response_model=CampaignInDB)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
-    """Get a specific campaign by ID"""
-    campaign = CampaignService.get_campaign(db, campaign_id)
+@router.put("/campaigns/{campaign_id}", response_model=CampaignInDB, response_model_exclude_unset=True)
+async def update_campaign(
+    campaign_id: int,
+    campaign_update: CampaignUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a campaign"""
+    campaign = await CampaignService.update_campaign(db, campaign_id, campaign_update.dict(exclude_unset=True))
     if campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
-@router.get("/campaigns/", response_model=List[CampaignInDB])
-def get_campaigns(
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/campaigns/", response_model=List[CampaignInDB], response_model_exclude_unset=True)
+async def get_campaigns(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    include_workflows: Optional[WorkflowInclusion] = INCLUDE_WORKFLOWS_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all campaigns with optional filtering"""
-    return CampaignService.get_campaigns(
-        db,
-        skip=skip,
-        limit=limit,
-        status=status
-    )
+    """
+    Get a page of campaigns with optional filtering.
+    `include_workflows` picks nested workflows (full), counts by status (summary) or nothing (none).
+    """
+    fieldset = parse_fields(fields, CAMPAIGN_COLUMNS)
+    include_workflows = workflow_inclusion(include_workflows, fieldset)
+    try:
+        campaigns, next_cursor = await CampaignService.get_campaigns(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            with_workflows=include_workflows == WorkflowInclusion.FULL,
+            fields=fieldset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    shaped = await shape_campaigns(db, campaigns, include_workflows, fieldset)
+    if fieldset is None:
+        set_next_cursor(response, next_cursor)
+        return shaped
+    # A sparse campaign does not satisfy the full response model, so it is serialized here
+    sparse = Response(b"[" + b",".join(map(campaign_json, shaped)) + b"]", media_type="application/json")
+    set_next_cursor(sparse, next_cursor)
+    return sparse
+
+@router.get("/metrics/cache")
+async def get_cache_metrics():
+    """Hit rates of the response and content analysis caches"""
+    return {"responses": response_cache.stats(), "analysis": analysis_cache_stats()}
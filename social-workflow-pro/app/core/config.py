@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 import secrets
 
 class Settings(BaseSettings):
@@ -13,6 +13,42 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./social_workflow.db"
+    # Defaults to DATABASE_URL with its async driver (sqlite+aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    ASYNC_DB_POOL_SIZE: int = 5
+
+    # NLP assets (resolved offline, see app/core/nlp.py)
+    NLTK_DATA_DIR: Optional[str] = None
+    SPACY_MODEL: str = "en_core_web_sm"
+    
+    # Content analysis results by content hash: in-memory entries, plus an optional SQLite file
+    ANALYSIS_CACHE_SIZE: int = 4096
+    ANALYSIS_CACHE_PATH: Optional[str] = None
+
+    # Serialized single-workflow/campaign responses kept for ETag revalidation
+    RESPONSE_CACHE_SIZE: int = 10000
+
+    # CPU-bound analysis runs in a process pool (default: up to 4 workers, 0 runs it inline).
+    # Past ANALYSIS_MAX_PENDING queued tasks, submitters wait up to the timeout and then get a 503
+    ANALYSIS_WORKERS: Optional[int] = None
+    ANALYSIS_MAX_PENDING: int = 64
+    ANALYSIS_SUBMIT_TIMEOUT_SECONDS: float = 5.0
+
+    # Publishing: most due workflows the dispatcher publishes at once
+    PUBLISH_MAX_IN_FLIGHT: int = 100
+    # Per platform: concurrent requests, sustained requests/second (bursts up to one second's worth)
+    PUBLISH_CONCURRENCY: Dict[str, int] = {"facebook": 10, "instagram": 5, "linkedin": 5, "twitter": 10}
+    PUBLISH_RATE_LIMITS: Dict[str, float] = {"facebook": 50.0, "instagram": 10.0, "linkedin": 10.0, "twitter": 50.0}
+    PUBLISH_TIMEOUT_SECONDS: float = 30.0
+    # Retries use exponential backoff with full jitter; exhausted workflows are dead-lettered
+    PUBLISH_MAX_ATTEMPTS: int = 5
+    PUBLISH_RETRY_BASE_SECONDS: float = 30.0
+    PUBLISH_RETRY_MAX_SECONDS: float = 3600.0
+    # Publish outcomes are written in batches: every interval, or sooner once this many are queued
+    STATUS_FLUSH_INTERVAL_SECONDS: float = 0.5
+    STATUS_FLUSH_MAX_PENDING: int = 500
+    # Base URL per platform publishing API; platforms without one are not sent anywhere
+    PLATFORM_API_URLS: Dict[str, str] = {}
     
     # Social Media API Credentials (Free Platforms Only)
     FACEBOOK_ACCESS_TOKEN: Optional[str] = None
@@ -0,0 +1,105 @@
+import sys
+import threading
+from functools import lru_cache
+from typing import FrozenSet, Optional
+from .config import settings
+
+# NLTK resource name -> path inside the NLTK data directory
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+_lock = threading.Lock()
+_resolved = set()
+
+
+def _nltk():
+    """Import NLTK with the configured offline data directory on its search path"""
+    import nltk
+
+    data_dir = settings.NLTK_DATA_DIR
+    if data_dir and data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    return nltk
+
+
+def require_nltk(*names: str) -> None:
+    """
+    Make sure the given NLTK resources are installed locally.
+
+    Resources are looked up once per process and never downloaded at runtime;
+    a missing resource raises LookupError pointing at `python -m app.core.nlp`.
+    """
+    if _resolved.issuperset(names):
+        return
+
+    with _lock:
+        nltk = _nltk()
+        for name in names:
+            if name in _resolved:
+                continue
+            try:
+                nltk.data.find(NLTK_RESOURCES[name])
+            except LookupError:
+                location = settings.NLTK_DATA_DIR or "the default NLTK data path"
+                raise LookupError(
+                    f"NLTK resource '{name}' is not installed in {location}; "
+                    "run `python -m app.core.nlp` to populate the cache"
+                ) from None
+            _resolved.add(name)
+
+
+@lru_cache(maxsize=None)
+def get_spacy(model: Optional[str] = None):
+    """Load a spaCy pipeline once per process"""
+    import spacy
+
+    return spacy.load(model or settings.SPACY_MODEL)
+
+
+@lru_cache(maxsize=None)
+def get_pos_tagger():
+    """
+    Shared perceptron POS tagger.
+
+    nltk.pos_tag() unpickles a fresh tagger on every call; holding one
+    instance avoids paying that per document.
+    """
+    require_nltk('averaged_perceptron_tagger')
+    from nltk.tag import PerceptronTagger
+
+    return PerceptronTagger()
+
+
+@lru_cache(maxsize=None)
+def get_vader():
+    """Shared VADER sentiment analyzer"""
+    require_nltk('vader_lexicon')
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def get_english_words() -> FrozenSet[str]:
+    """Vocabulary of the NLTK `words` corpus, loaded once"""
+    require_nltk('words')
+    return frozenset(_nltk().corpus.words.words())
+
+
+def download_resources(download_dir: Optional[str] = None) -> None:
+    """Populate the offline cache. This is the only code path that touches the network."""
+    nltk = _nltk()
+    target = download_dir or settings.NLTK_DATA_DIR
+    for name in NLTK_RESOURCES:
+        nltk.download(name, download_dir=target, quiet=True)
+
+
+if __name__ == "__main__":
+    download_resources(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,171 @@
+from datetime import datetime
+from typing import Callable, List, Sequence, Tuple
+import logging
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection
+from .session import async_engine
+
+logger = logging.getLogger(__name__)
+
+# Versions already applied
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# The schema as first shipped. Every statement is IF NOT EXISTS, so databases
+# laid out by the old import-time create_all adopt this history unchanged.
+BASELINE = (
+    """CREATE TABLE IF NOT EXISTS teams (
+        name VARCHAR(100) NOT NULL,
+        description VARCHAR(500),
+        id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_teams_id ON teams (id)",
+    """CREATE TABLE IF NOT EXISTS users (
+        username VARCHAR(50) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        hashed_password VARCHAR(255) NOT NULL,
+        role VARCHAR(50),
+        is_active BOOLEAN,
+        team_id INTEGER,
+        id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (username),
+        UNIQUE (email),
+        FOREIGN KEY(team_id) REFERENCES teams (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)",
+    """CREATE TABLE IF NOT EXISTS campaigns (
+        id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description VARCHAR(1000),
+        start_date DATETIME,
+        end_date DATETIME,
+        status VARCHAR(50),
+        content_metadata JSON,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_id ON campaigns (id)",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_name ON campaigns (name)",
+    # Enum columns hold the member names; SQLite does not enforce VARCHAR lengths,
+    # so later statuses such as DEAD_LETTER need no change here
+    """CREATE TABLE IF NOT EXISTS workflows (
+        id INTEGER NOT NULL,
+        campaign_id INTEGER,
+        content_type VARCHAR(5),
+        status VARCHAR(9),
+        platform VARCHAR(9),
+        content JSON,
+        schedule_time DATETIME,
+        metadata JSON,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(campaign_id) REFERENCES campaigns (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_workflows_id ON workflows (id)",
+    """CREATE TABLE IF NOT EXISTS approvals (
+        workflow_id INTEGER,
+        approver_id INTEGER,
+        status VARCHAR(50),
+        comments VARCHAR(1000),
+        id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(workflow_id) REFERENCES workflows (id),
+        FOREIGN KEY(approver_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_approvals_id ON approvals (id)",
+)
+
+# Keyset listings: filter column first, then the sort key
+LISTING_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_status_start ON campaigns (status, start_date, id)",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_start ON campaigns (start_date, id)",
+    "CREATE INDEX IF NOT EXISTS ix_workflows_campaign_schedule ON workflows (campaign_id, schedule_time, id)",
+    "CREATE INDEX IF NOT EXISTS ix_workflows_status_schedule ON workflows (status, schedule_time, id)",
+    "CREATE INDEX IF NOT EXISTS ix_workflows_schedule ON workflows (schedule_time, id)",
+)
+
+# Pending publishes for the dispatcher
+SCHEDULED_JOBS = (
+    """CREATE TABLE IF NOT EXISTS scheduled_jobs (
+        workflow_id INTEGER NOT NULL,
+        run_at DATETIME NOT NULL,
+        id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (workflow_id),
+        FOREIGN KEY(workflow_id) REFERENCES workflows (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_scheduled_jobs_id ON scheduled_jobs (id)",
+    "CREATE INDEX IF NOT EXISTS ix_scheduled_jobs_run_at ON scheduled_jobs (run_at)",
+)
+
+# Publish retries: one row per attempt, and a retry count on each pending job
+PUBLISH_ATTEMPTS = (
+    """CREATE TABLE IF NOT EXISTS publish_attempts (
+        workflow_id INTEGER NOT NULL,
+        idempotency_key VARCHAR(100) NOT NULL,
+        attempt INTEGER NOT NULL,
+        succeeded BOOLEAN NOT NULL,
+        error VARCHAR(1000),
+        id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(workflow_id) REFERENCES workflows (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_publish_attempts_id ON publish_attempts (id)",
+    "CREATE INDEX IF NOT EXISTS ix_publish_attempts_workflow_id ON publish_attempts (workflow_id)",
+    "CREATE INDEX IF NOT EXISTS ix_publish_attempts_idempotency_key ON publish_attempts (idempotency_key)",
+)
+
+def _run(statements: Sequence[str]) -> Callable[[Connection], None]:
+    def step(connection: Connection) -> None:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+    return step
+
+def _publish_retries(connection: Connection) -> None:
+    _run(PUBLISH_ATTEMPTS)(connection)
+    # ADD COLUMN has no IF NOT EXISTS; create_all may already have added it
+    columns = {column["name"] for column in inspect(connection).get_columns("scheduled_jobs")}
+    if "attempts" not in columns:
+        connection.exec_driver_sql("ALTER TABLE scheduled_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+# Applied in order, once each
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_baseline", _run(BASELINE)),
+    ("0002_listing_indexes", _run(LISTING_INDEXES)),
+    ("0003_scheduled_jobs", _run(SCHEDULED_JOBS)),
+    ("0004_publish_retries", _publish_retries),
+]
+
+def migrate(connection: Connection) -> List[str]:
+    """Apply the migrations this database has not seen yet; returns their versions"""
+    schema_migrations.create(connection, checkfirst=True)
+    applied = set(connection.scalars(select(schema_migrations.c.version)))
+    pending = [(version, step) for version, step in MIGRATIONS if version not in applied]
+    for version, step in pending:
+        step(connection)
+        connection.execute(schema_migrations.insert().values(version=version, applied_at=datetime.utcnow()))
+        logger.info("Applied schema migration %s", version)
+    return [version for version, _ in pending]
+
+async def run_migrations() -> List[str]:
+    """migrate() in a single transaction on the async engine"""
+    async with async_engine.begin() as connection:
+        return await connection.run_sync(migrate)
@@ -1,13 +1,38 @@
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from ..core.config import settings
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(url: str) -> str:
+    """Async driver URL for a sync database URL (sqlite -> aiosqlite)"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+# Request handlers run on the event loop, so they get sessions from the async engine.
+# aiosqlite defaults to one new connection per session; under load hundreds of them
+# fight over SQLite's write lock, so connections come from a bounded pool instead.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=0
+)
+# Objects stay loaded after commit: lazy refreshes would need I/O outside an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,17 +1,44 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .core.config import settings
 from .api.endpoints import workflow
-from .db.session import engine
-from .models.base import Base
+from .db.migrations import run_migrations
+from .utils.executor import ExecutorBusy, analysis_executor
+from .utils.publisher import publisher_pool
+from .utils.scheduler import dispatcher
+from .utils.status_writer import status_writer
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+async def start_background_services():
+    # Workers load their NLP models before the first request arrives
+    await analysis_executor.start()
+    # Re-queue every persisted job; anything that fell due while down publishes now
+    await status_writer.start()
+    await dispatcher.start()
+
+async def stop_background_services():
+    await dispatcher.stop()
+    # In-flight publishes have finished, so this final flush records every outcome
+    await status_writer.stop()
+    await publisher_pool.close()
+    analysis_executor.shutdown()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at import time; the schema is brought up to date here
+    await run_migrations()
+    await start_background_services()
+    try:
+        yield
+    finally:
+        await stop_background_services()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS
@@ -21,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -30,6 +58,10 @@ app.include_router(
     tags=["workflows"]
 )
 
+@app.exception_handler(ExecutorBusy)
+async def analysis_busy(request: Request, exc: ExecutorBusy):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to your private Social Workflow Pro instance"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Enum, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Enum, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
@@ -16,6 +16,7 @@ class WorkflowStatus(str, enum.Enum):
     SCHEDULED = "scheduled"
     PUBLISHED = "published"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
 
 class Platform(str, enum.Enum):
     FACEBOOK = "facebook"
@@ -24,6 +25,11 @@ class Platform(str, enum.Enum):
 
 class Campaign(BaseModel):
     __tablename__ = "campaigns"
+    # Keyset listings: filter column first, then the (start_date, id) sort key
+    __table_args__ = (
+        Index("ix_campaigns_status_start", "status", "start_date", "id"),
+        Index("ix_campaigns_start", "start_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -36,6 +42,12 @@ class Campaign(BaseModel):
 
 class Workflow(BaseModel):
     __tablename__ = "workflows"
+    # Keyset listings: filter column first, then the (schedule_time, id) sort key
+    __table_args__ = (
+        Index("ix_workflows_campaign_schedule", "campaign_id", "schedule_time", "id"),
+        Index("ix_workflows_status_schedule", "status", "schedule_time", "id"),
+        Index("ix_workflows_schedule", "schedule_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
@@ -44,10 +56,32 @@ class Workflow(BaseModel):
     platform = Column(Enum(Platform))
     content = Column(JSON)
     schedule_time = Column(DateTime)
-    metadata = Column(JSON)
+    # `metadata` is reserved by the declarative API; the column and the API field keep the name
+    meta = Column("metadata", JSON)
     campaign = relationship("Campaign", back_populates="workflows")
     approvals = relationship("Approval", back_populates="workflow")
 
+class ScheduledJob(BaseModel):
+    """A pending publish; the dispatcher's in-memory heap is rebuilt from these on startup"""
+    __tablename__ = "scheduled_jobs"
+
+    workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=False, unique=True)
+    run_at = Column(DateTime, nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+class PublishAttempt(BaseModel):
+    """
+    One try at publishing a workflow; retries of the same scheduled post share an idempotency key.
+    `attempt` counts within one run of the retry budget, so a replayed workflow starts again at 1.
+    """
+    __tablename__ = "publish_attempts"
+
+    workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=False, index=True)
+    idempotency_key = Column(String(100), nullable=False, index=True)
+    attempt = Column(Integer, nullable=False)
+    succeeded = Column(Boolean, nullable=False)
+    error = Column(String(1000))
+
 class Approval(BaseModel):
     __tablename__ = "approvals"
 
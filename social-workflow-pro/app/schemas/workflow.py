@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, create_model
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, Type
 from enum import Enum
 
 class ContentType(str, Enum):
@@ -16,6 +17,7 @@ class WorkflowStatus(str, Enum):
     SCHEDULED = "scheduled"
     PUBLISHED = "published"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
 
 class WorkflowBase(BaseModel):
     content_type: ContentType
@@ -27,6 +29,22 @@ class WorkflowBase(BaseModel):
 class WorkflowCreate(WorkflowBase):
     campaign_id: int
 
+MAX_BULK_WORKFLOWS = 1000
+
+class WorkflowBulkCreate(BaseModel):
+    workflows: List[WorkflowCreate] = Field(..., min_length=1, max_length=MAX_BULK_WORKFLOWS)
+
+class WorkflowBulkItem(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: Optional[WorkflowStatus] = None
+    error: Optional[str] = None
+
+class WorkflowBulkResult(BaseModel):
+    created: int
+    rejected: int
+    results: List[WorkflowBulkItem]
+
 class WorkflowUpdate(BaseModel):
     content: Optional[Dict[str, Any]] = None
     schedule_time: Optional[datetime] = None
@@ -34,6 +52,8 @@ class WorkflowUpdate(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 class WorkflowInDB(WorkflowBase):
+    # Read from the model's `meta` attribute, or a row's `metadata` column
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias=AliasChoices("meta", "metadata"))
     id: int
     campaign_id: int
     status: WorkflowStatus
@@ -60,11 +80,47 @@ class CampaignUpdate(BaseModel):
     end_date: Optional[datetime] = None
     status: Optional[str] = None
 
+class PublishAttemptInDB(BaseModel):
+    id: int
+    workflow_id: int
+    idempotency_key: str
+    attempt: int
+    succeeded: bool
+    error: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DeadLetterReplay(BaseModel):
+    # Replays every dead-lettered workflow when omitted
+    workflow_ids: Optional[List[int]] = None
+
+class DeadLetterReplayResult(BaseModel):
+    replayed: int
+    workflow_ids: List[int]
+
+class WorkflowInclusion(str, Enum):
+    FULL = "full"
+    NONE = "none"
+    SUMMARY = "summary"
+
 class CampaignInDB(CampaignBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    workflows: List[WorkflowInDB] = []
+    # Only the one matching the requested WorkflowInclusion is set
+    workflows: Optional[List[WorkflowInDB]] = None
+    workflow_counts: Optional[Dict[str, int]] = None
 
     class Config:
         from_attributes = True
+
+@lru_cache(maxsize=256)
+def fieldset_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """`model` cut down to `fields`, for sparse fieldset responses; built once per field set"""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
@@ -2,24 +2,14 @@ from typing import List, Dict
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
-from nltk.sentiment import SentimentIntensityAnalyzer
 from textblob import TextBlob
 import random
-import spacy
+from ..core.nlp import get_spacy, get_vader
 from ..models.workflow import ContentType, Platform
+from ..utils.executor import analysis_executor
 
 class AIContentService:
     def __init__(self):
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
-        nltk.download('vader_lexicon')
-        nltk.download('stopwords')
-        
-        # Initialize free NLP tools
-        self.nlp = spacy.load('en_core_web_sm')
-        self.sia = SentimentIntensityAnalyzer()
-        
         # Load pre-made templates
         self.templates = {
             'product': [
@@ -46,6 +36,16 @@ class AIContentService:
             'call_to_actions': ['Try now!', 'Learn more!', 'Join us!', 'Get started!', 'Discover more!']
         }
     
+    @property
+    def nlp(self):
+        """spaCy pipeline, shared across instances and loaded on first use"""
+        return get_spacy()
+
+    @property
+    def sia(self):
+        """VADER analyzer, shared across instances and loaded on first use"""
+        return get_vader()
+
     async def generate_content(
         self,
         brand_voice: str,
@@ -75,7 +75,7 @@ class AIContentService:
         
         return {
             "content": content,
-            "suggestions": self._analyze_content_performance(content, platform)
+            "suggestions": await self.analyze_content_performance(content, platform)
         }
     
     def _enhance_content(self, content: str, platform: Platform) -> str:
@@ -115,6 +115,10 @@ class AIContentService:
             "opportunities": self._extract_opportunities(trends)
         }
     
+    async def analyze_content_performance(self, content: str, platform: Platform) -> List[str]:
+        """Performance suggestions computed in the analysis worker pool, where spaCy and VADER stay loaded"""
+        return await analysis_executor.run(_content_performance, content, platform)
+
     def _analyze_content_performance(self, content: str, platform: Platform) -> List[str]:
         """Analyze content using free NLP tools"""
         
@@ -150,3 +154,7 @@ class AIContentService:
         for trend in trends:
             opportunities.append(f"Capitalize on {trend.lower()} with targeted content")
         return opportunities
+
+def _content_performance(content: str, platform: Platform) -> List[str]:
+    # Module level so worker processes can unpickle it
+    return AIContentService()._analyze_content_performance(content, platform)
@@ -1,14 +1,23 @@
-from typing import Dict, List
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestRegressor
+from typing import TYPE_CHECKING, Dict, List
+from functools import cached_property
 from datetime import datetime, timedelta
 
+if TYPE_CHECKING:
+    import numpy as np
+
 class AnalyticsService:
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.predictor = RandomForestRegressor()
+    # Estimators (and scikit-learn with them) load on first use
+    @cached_property
+    def scaler(self):
+        from sklearn.preprocessing import StandardScaler
+
+        return StandardScaler()
+
+    @cached_property
+    def predictor(self):
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor()
 
     async def generate_performance_report(
         self,
@@ -122,12 +131,12 @@ class AnalyticsService:
         # Implementation for feature extraction
         pass
     
-    def _calculate_confidence(self, prediction: np.ndarray):
+    def _calculate_confidence(self, prediction: "np.ndarray"):
         """Calculate confidence score for prediction"""
         # Implementation for confidence calculation
         pass
     
-    def _generate_optimization_suggestions(self, features: np.ndarray):
+    def _generate_optimization_suggestions(self, features: "np.ndarray"):
         """Generate suggestions for content optimization"""
         # Implementation for suggestion generation
         pass
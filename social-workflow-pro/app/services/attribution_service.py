@@ -1,13 +1,17 @@
-from typing import Dict, List
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from typing import TYPE_CHECKING, Dict, List
+from functools import cached_property
 from datetime import datetime, timedelta
-import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class AttributionService:
-    def __init__(self):
-        self.model = RandomForestClassifier()
-        
+    @cached_property
+    def model(self):
+        from sklearn.ensemble import RandomForestClassifier
+
+        return RandomForestClassifier()
+
     async def track_multi_touch_attribution(self, user_journey_data: Dict):
         """
         Advanced multi-touch attribution tracking across all platforms
@@ -34,11 +38,13 @@ class AttributionService:
     
     def _process_touchpoints(self, journey_data: Dict):
         """Process and clean user journey data"""
+        import pandas as pd
+
         touchpoints_df = pd.DataFrame(journey_data)
         # Advanced touchpoint processing
         return touchpoints_df
     
-    def _analyze_conversion_paths(self, touchpoints: pd.DataFrame):
+    def _analyze_conversion_paths(self, touchpoints: "pd.DataFrame"):
         """Analyze different paths to conversion"""
         paths = touchpoints.groupby('conversion_path').agg({
             'conversion': 'sum',
@@ -46,17 +52,17 @@ class AttributionService:
         })
         return paths.to_dict()
     
-    def _calculate_channel_value(self, touchpoints: pd.DataFrame):
+    def _calculate_channel_value(self, touchpoints: "pd.DataFrame"):
         """Calculate true value of each channel"""
         # Implement advanced channel value calculation
         pass
     
-    def _measure_touchpoint_impact(self, touchpoints: pd.DataFrame):
+    def _measure_touchpoint_impact(self, touchpoints: "pd.DataFrame"):
         """Measure the impact of each touchpoint"""
         # Implement touchpoint impact measurement
         pass
     
-    def _calculate_channel_roi(self, touchpoints: pd.DataFrame):
+    def _calculate_channel_roi(self, touchpoints: "pd.DataFrame"):
         """Calculate detailed ROI for each channel"""
         # Implement channel ROI calculation
         pass
@@ -1,8 +1,11 @@
 from textblob import TextBlob
-import cv2
-import numpy as np
-from typing import List, Dict, Union
+from typing import TYPE_CHECKING, List, Dict, Union
 import re
+from ..utils.executor import analysis_executor
+from ..utils.text_features import ANALYZER_CTA, TextFeatures, extract_features
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class ContentOptimizer:
     def __init__(self):
@@ -11,6 +14,9 @@ class ContentOptimizer:
         
     def optimize_image(self, image_path: str) -> Dict:
         """Optimize images for social media using OpenCV"""
+        # OpenCV is imported on first use, not by every process that analyzes text
+        import cv2
+
         image = cv2.imread(image_path)
         
         # Auto-enhance
@@ -30,8 +36,10 @@ class ContentOptimizer:
             
         return optimized
     
-    def _auto_enhance(self, image: np.ndarray) -> np.ndarray:
+    def _auto_enhance(self, image: "np.ndarray") -> "np.ndarray":
         """Auto-enhance image quality"""
+        import cv2
+
         # Convert to LAB color space
         lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
@@ -140,20 +148,29 @@ class ContentOptimizer:
         }
         return hashtags.get(industry.lower(), [])
     
+    async def analyze_content_async(self, content: str) -> Dict:
+        """analyze_content in the analysis worker pool, off the event loop"""
+        return await analysis_executor.run(_analyze_text, content)
+
+    async def analyze_contents(self, contents: List[str]) -> List[Dict]:
+        """analyze_content for many texts, batched across the analysis workers"""
+        return await analysis_executor.map(_analyze_text, contents)
+
     def analyze_content(self, content: str) -> Dict:
         """Analyze content quality"""
         # Simple text analysis
         blob = TextBlob(content)
+        features = extract_features(content)
         
         # Basic metrics
         metrics = {
-            'length': len(content),
-            'hashtags': len(re.findall(r'#\w+', content)),
-            'questions': len(re.findall(r'\?', content)),
-            'calls_to_action': len(re.findall(r'(click|share|like|comment|follow|check out)', content.lower())),
-            'emojis': len(re.findall(r'[\U0001F300-\U0001F999]', content)),
+            'length': features.length,
+            'hashtags': features.hashtags,
+            'questions': features.questions,
+            'calls_to_action': features.calls_to_action(ANALYZER_CTA),
+            'emojis': features.emojis,
             'sentiment': blob.sentiment.polarity,
-            'readability': self._calculate_readability(content)
+            'readability': self._calculate_readability(features)
         }
         
         return {
@@ -161,13 +178,13 @@ class ContentOptimizer:
             'improvements': self._suggest_improvements(metrics)
         }
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, features: TextFeatures) -> float:
         """Calculate text readability score"""
-        words = len(text.split())
-        sentences = len(re.split(r'[.!?]+', text))
-        syllables = len(re.findall(r'[aeiou]+', text.lower()))
+        words = features.words
+        sentences = features.sentences
+        syllables = features.syllables
         
-        if sentences == 0:
+        if sentences == 0 or words == 0:
             return 0
             
         return 206.835 - 1.015 * (words/sentences) - 84.6 * (syllables/words)
@@ -197,3 +214,7 @@ class ContentOptimizer:
             suggestions.append("Consider adding a question to increase engagement")
             
         return suggestions
+
+def _analyze_text(content: str) -> Dict:
+    # Module level so worker processes can unpickle it
+    return ContentOptimizer().analyze_content(content)
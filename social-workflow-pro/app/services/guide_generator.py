@@ -1,16 +1,10 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 import os
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List
 
 class GuideGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        
         # Free tools recommendations
         self.free_tools = {
             'photo_editing': [
@@ -96,6 +90,9 @@ class GuideGenerator:
         
     def create_business_guide(self, business_name: str, business_type: str, target_audience: str) -> str:
         """Create a guide using free ReportLab library"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate
+
         filename = f"{business_type}_growth_guide_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         filepath = os.path.join('guides', filename)
         os.makedirs('guides', exist_ok=True)
@@ -126,8 +123,17 @@ class GuideGenerator:
         doc.build(story)
         return filepath
     
+    # ReportLab loads when the first guide is built
+    @cached_property
+    def styles(self):
+        from reportlab.lib.styles import getSampleStyleSheet
+
+        return getSampleStyleSheet()
+
     def add_cover(self, story, business_name: str, business_type: str):
         """Add cover page using free styling"""
+        from reportlab.platypus import Paragraph, Spacer
+
         title = Paragraph(
             f"Growth Strategy Guide for {business_name}",
             self.styles['Title']
@@ -145,6 +151,8 @@ class GuideGenerator:
     
     def add_free_tools_section(self, story):
         """Add section about free tools"""
+        from reportlab.platypus import Paragraph, Spacer
+
         title = Paragraph("Free Tools for Your Business", self.styles['Heading1'])
         story.extend([title, Spacer(1, 20)])
         
@@ -160,6 +168,8 @@ class GuideGenerator:
     
     def add_business_content(self, story, business_type: str, target_audience: str):
         """Add business-specific content"""
+        from reportlab.platypus import Paragraph, Spacer
+
         templates = self.business_templates.get(business_type.lower(), self.get_generic_templates())
         
         # Add content strategy
@@ -0,0 +1,79 @@
+import nltk
+from typing import Dict, List, Tuple
+from ..core.nlp import require_nltk, get_pos_tagger
+from ..utils.cache import LRUCache
+
+# Part-of-speech tags kept as hashtag keywords
+KEYWORD_TAGS = frozenset(['NN', 'NNS', 'JJ', 'VB'])
+
+# Industry-specific hashtags, built once; callers always receive copies
+INDUSTRY_HASHTAGS = {
+    'restaurant': {
+        'general': ['#foodie', '#instafood', '#foodstagram'],
+        'quality': ['#homemade', '#fresh', '#delicious'],
+        'experience': ['#foodlover', '#foodphotography', '#yummy']
+    },
+    'retail': {
+        'general': ['#fashion', '#style', '#shopping'],
+        'quality': ['#trendy', '#luxury', '#quality'],
+        'experience': ['#shoplocal', '#boutique', '#musthave']
+    },
+    'fitness': {
+        'general': ['#fitness', '#workout', '#gym'],
+        'quality': ['#strong', '#healthy', '#fit'],
+        'experience': ['#motivation', '#fitnessmotivation', '#lifestyle']
+    }
+}
+
+# Keywords per normalized text, shared by every HashtagService in the process
+_keyword_cache = LRUCache(maxsize=4096)
+
+def normalize_text(text: str) -> str:
+    """Cache key for a document: lowercased with whitespace collapsed"""
+    return ' '.join(text.lower().split())
+
+class HashtagService:
+    def extract_keywords(self, text: str) -> Tuple[str, ...]:
+        """Nouns, adjectives and base verbs in `text`, in order of first appearance"""
+        return self.extract_keywords_batch([text])[0]
+
+    def extract_keywords_batch(self, texts: List[str]) -> List[Tuple[str, ...]]:
+        """Extract keywords for many documents, tagging all cache misses in one call"""
+        normalized = [normalize_text(text) for text in texts]
+        keywords = {}
+        misses = []
+        for key in dict.fromkeys(normalized):
+            cached = _keyword_cache.get(key)
+            if cached is None:
+                misses.append(key)
+            else:
+                keywords[key] = cached
+
+        if misses:
+            require_nltk('punkt', 'averaged_perceptron_tagger')
+            tagged_docs = get_pos_tagger().tag_sents(nltk.word_tokenize(key) for key in misses)
+            for key, tagged in zip(misses, tagged_docs):
+                keywords[key] = tuple(dict.fromkeys(
+                    word for word, tag in tagged if tag in KEYWORD_TAGS
+                ))
+                _keyword_cache.put(key, keywords[key])
+
+        return [keywords[key] for key in normalized]
+
+    def generate_hashtag_groups(self, industry: str, content: str) -> Dict[str, List[str]]:
+        """Generate grouped hashtags for the content"""
+        return self.generate_hashtag_groups_batch(industry, [content])[0]
+
+    def generate_hashtag_groups_batch(self, industry: str, contents: List[str]) -> List[Dict[str, List[str]]]:
+        """Generate grouped hashtags for several pieces of content in one tagging pass"""
+        industry_groups = INDUSTRY_HASHTAGS.get(industry, {})
+
+        groups = []
+        for keywords in self.extract_keywords_batch(contents):
+            hashtag_groups = {name: list(tags) for name, tags in industry_groups.items()}
+            # Add content-specific hashtags
+            hashtag_groups['content'] = [f"#{keyword}" for keyword in keywords
+                                         if len(keyword) > 3][:5]
+            groups.append(hashtag_groups)
+
+        return groups
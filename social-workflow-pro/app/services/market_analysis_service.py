@@ -1,14 +1,23 @@
-from typing import List, Dict
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from typing import TYPE_CHECKING, List, Dict
+from functools import cached_property
 from textblob import TextBlob
-import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class MarketAnalysisService:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
-        self.cluster_model = KMeans(n_clusters=5)
+    # pandas and scikit-learn load inside the methods that need them
+    @cached_property
+    def vectorizer(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        return TfidfVectorizer()
+
+    @cached_property
+    def cluster_model(self):
+        from sklearn.cluster import KMeans
+
+        return KMeans(n_clusters=5)
 
     async def analyze_competitors(self, competitor_handles: List[str]):
         """Analyze competitor social media presence and strategy"""
@@ -44,6 +53,8 @@ class MarketAnalysisService:
     
     async def predict_trends(self, historical_data: Dict):
         """Predict upcoming trends based on historical data"""
+        import pandas as pd
+
         df = pd.DataFrame(historical_data)
         
         # Time series analysis for trend prediction
@@ -65,6 +76,8 @@ class MarketAnalysisService:
     
     def _analyze_engagement(self, data: Dict):
         """Analyze engagement patterns and metrics"""
+        import pandas as pd
+
         engagement_metrics = pd.DataFrame(data['engagement'])
         
         return {
@@ -83,6 +96,8 @@ class MarketAnalysisService:
     
     def _analyze_posting_patterns(self, data: Dict):
         """Analyze posting frequency and timing patterns"""
+        import pandas as pd
+
         posts_df = pd.DataFrame(data['posts'])
         
         return {
@@ -93,6 +108,8 @@ class MarketAnalysisService:
     
     def _analyze_sentiment(self, data: Dict):
         """Analyze audience sentiment and reactions"""
+        import numpy as np
+
         comments = data.get('comments', [])
         sentiments = [TextBlob(comment).sentiment.polarity for comment in comments]
         
@@ -122,12 +139,12 @@ class MarketAnalysisService:
         # Implementation for scoring system
         pass
     
-    def _analyze_time_series(self, df: pd.DataFrame):
+    def _analyze_time_series(self, df: "pd.DataFrame"):
         """Perform time series analysis for trend prediction"""
         # Implementation for time series analysis
         pass
     
-    def _predict_content_themes(self, df: pd.DataFrame):
+    def _predict_content_themes(self, df: "pd.DataFrame"):
         """Predict upcoming content themes"""
         # Implementation for theme prediction
         pass
@@ -4,25 +4,21 @@ import re
 from collections import Counter
 from typing import List, Dict
 from datetime import datetime
+from ..core.nlp import require_nltk, get_english_words
+from ..utils.templates import compile_template
 
 class MarketAnalyzer:
-    def __init__(self):
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
-        nltk.download('maxent_ne_chunker')
-        nltk.download('words')
-
     def analyze_competitors(self, competitor_content: List[str]) -> Dict:
         """Analyze competitor content using basic NLP"""
         # Extract keywords
+        require_nltk('punkt')
         all_words = []
         for content in competitor_content:
             words = nltk.word_tokenize(content.lower())
             all_words.extend(words)
             
         # Remove common words
-        common_words = set(nltk.corpus.words.words())
+        common_words = get_english_words()
         keywords = [w for w in all_words if w not in common_words and w.isalnum()]
         
         # Get keyword frequency
@@ -48,6 +44,7 @@ class MarketAnalyzer:
     def _extract_themes(self, texts: List[str]) -> List[List[str]]:
         """Extract common themes from texts"""
         # Get bigrams (2-word phrases)
+        require_nltk('punkt')
         bigrams = []
         for text in texts:
             words = nltk.word_tokenize(text.lower())
@@ -66,17 +63,19 @@ class MarketAnalyzer:
         templates = self.get_industry_templates(industry)
         ideas = []
         
+        compiled = [compile_template(template) for template in templates]
+        
         for theme in themes:
             theme_str = ' '.join(theme)
-            for template in templates:
+            for template in compiled:
                 # Replace placeholders with actual content
-                idea = template.replace('[THEME]', theme_str)
-                if '[KEYWORD]' in template:
-                    for keyword in keywords[:3]:  # Use top 3 keywords
-                        idea_with_keyword = idea.replace('[KEYWORD]', keyword)
-                        ideas.append(idea_with_keyword)
+                if 'KEYWORD' in template.slots:
+                    ideas.extend(template.render_batch(
+                        {'THEME': theme_str, 'KEYWORD': keyword}
+                        for keyword in keywords[:3]  # Use top 3 keywords
+                    ))
                 else:
-                    ideas.append(idea)
+                    ideas.append(template.render({'THEME': theme_str}))
 
         return list(set(ideas))  # Remove duplicates
 
@@ -1,15 +1,21 @@
 from typing import Dict, List
-import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-import numpy as np
+from functools import cached_property
 from datetime import datetime
 
 class PersonalizationService:
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.cluster_model = KMeans(n_clusters=10)
-        
+    # Built lazily so importing this module stays cheap
+    @cached_property
+    def scaler(self):
+        from sklearn.preprocessing import StandardScaler
+
+        return StandardScaler()
+
+    @cached_property
+    def cluster_model(self):
+        from sklearn.cluster import KMeans
+
+        return KMeans(n_clusters=10)
+
     async def generate_personalized_content(self, audience_segment: Dict, content_template: str):
         """
         Generate hyper-personalized content for different audience segments
@@ -1,15 +1,21 @@
-import nltk
 from textblob import TextBlob
 import re
 from collections import Counter, defaultdict
 from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
 import math
+from ..utils.templates import compile_template
+from ..utils.text_features import ANALYZER_CTA, extract_features_batch
+
+# Opening phrase substituted for [hook] by each viral pattern
+PATTERN_HOOKS = {
+    'storytelling': 'the incredible story of how',
+    'emotional': 'you won\'t believe',
+    'value_hooks': 'the secret to'
+}
 
 class TrendAnalyzer:
     def __init__(self):
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
         self.viral_patterns = {
             'storytelling': [
                 r'(how|why|what).+(changed|learned|discovered)',
@@ -97,17 +103,14 @@ class TrendAnalyzer:
     def _analyze_content_elements(self, posts: List[Dict]) -> Dict:
         """Analyze successful content elements"""
         elements = defaultdict(list)
+        features = extract_features_batch(post['content'] for post in posts)
         
-        for post in posts:
-            content = post['content']
-            elements['length'].append((len(content), post['engagement']))
-            elements['hashtags'].append((len(re.findall(r'#\w+', content)), 
-                                      post['engagement']))
-            elements['mentions'].append((len(re.findall(r'@\w+', content)), 
-                                      post['engagement']))
-            elements['emojis'].append((len(re.findall(r'[\U0001F300-\U0001F999]', 
-                                                    content)), 
-                                    post['engagement']))
+        for post, post_features in zip(posts, features):
+            engagement = post['engagement']
+            elements['length'].append((post_features.length, engagement))
+            elements['hashtags'].append((post_features.hashtags, engagement))
+            elements['mentions'].append((post_features.mentions, engagement))
+            elements['emojis'].append((post_features.emojis, engagement))
             
         # Calculate optimal ranges
         optimal_ranges = {}
@@ -128,17 +131,18 @@ class TrendAnalyzer:
         """Analyze factors contributing to engagement"""
         factors = defaultdict(float)
         total_posts = len(posts)
+        features = extract_features_batch(post['content'] for post in posts)
         
-        for post in posts:
+        for post, post_features in zip(posts, features):
             content = post['content'].lower()
             engagement = post['engagement']
             
             # Analyze question impact
-            if '?' in content:
+            if post_features.questions:
                 factors['questions'] += engagement
                 
             # Analyze call-to-action impact
-            if re.search(r'(click|share|like|comment|follow|check out)', content):
+            if post_features.calls_to_action(ANALYZER_CTA):
                 factors['calls_to_action'] += engagement
                 
             # Analyze emotional words impact
@@ -202,7 +206,8 @@ class TrendAnalyzer:
                         suggestions.append({
                             'content': suggestion,
                             'pattern': category,
-                            'type': template['type']
+                            'type': template['type'],
+                            'unfilled_slots': compile_template(suggestion).missing({})
                         })
         
         # Add timing recommendations
@@ -265,12 +270,9 @@ class TrendAnalyzer:
         content = template['template']
         
         # Apply pattern-specific modifications
-        if pattern == 'storytelling':
-            content = content.replace('[hook]', 'the incredible story of how')
-        elif pattern == 'emotional':
-            content = content.replace('[hook]', 'you won\'t believe')
-        elif pattern == 'value_hooks':
-            content = content.replace('[hook]', 'the secret to')
+        hook = PATTERN_HOOKS.get(pattern)
+        if hook is not None:
+            content = compile_template(content).render({'hook': hook})
             
         return content
     
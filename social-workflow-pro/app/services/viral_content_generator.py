@@ -1,14 +1,52 @@
-import nltk
 from textblob import TextBlob
-import re
+import base64
+import copy
+import heapq
+import json
 from collections import defaultdict
-from typing import List, Dict
+from functools import lru_cache
+from typing import Callable, List, Dict, Tuple, Iterator, Optional
 import random
+from .hashtag_service import HashtagService
+from ..utils.cache import LRUCache
+from ..utils.templates import compile_template, unfilled_slots
+from ..utils.text_features import EMOJI_RE, VIRAL_CTA, TextFeatures, extract_features, extract_features_batch
+
+# Seeded generation results keyed by (kind, industry, topic, hook_type, duration, seed)
+_result_cache = LRUCache(maxsize=256)
+
+@lru_cache(maxsize=4096)
+def _sentiment(content: str) -> float:
+    """
+    TextBlob polarity of a generated post, scored on the whole text so
+    negations and intensifiers keep their context; cached across posts.
+    """
+    return TextBlob(content).sentiment.polarity
+
+def engagement_score(elements: Dict) -> float:
+    """Rank ideas by engagement hooks and tone, penalizing posts over 280 characters"""
+    return (
+        elements['questions']
+        + elements['calls_to_action']
+        + min(elements['emojis'], 5) * 0.5
+        + elements['sentiment']
+        - max(elements['length'] - 280, 0) / 100
+    )
+
+def _encode_cursor(seed: int, score: float, index: int) -> str:
+    payload = json.dumps({'seed': seed, 'score': score, 'index': index})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[int, float, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(payload['seed']), float(payload['score']), int(payload['index'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor") from None
 
 class ViralContentGenerator:
     def __init__(self):
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
+        self.hashtag_service = HashtagService()
         
         self.viral_hooks = {
             'curiosity': [
@@ -106,41 +144,147 @@ class ViralContentGenerator:
             }
         }
         
-    def generate_viral_content(self, industry: str, topic: str, hook_type: str) -> List[Dict]:
-        """Generate viral content ideas"""
+    def generate_viral_content(
+        self,
+        industry: str,
+        topic: str,
+        hook_type: str,
+        seed: Optional[int] = None
+    ) -> List[Dict]:
+        """Generate viral content ideas; a seed makes the result reproducible and cacheable"""
+        return self._cached(
+            ('viral', industry, topic, hook_type, None, seed),
+            seed,
+            lambda rng: self._generate_viral_content(industry, topic, hook_type, rng)
+        )
+    
+    def _generate_viral_content(self, industry: str, topic: str, hook_type: str, rng: random.Random) -> List[Dict]:
         # Get relevant templates
         industry_templates = self.content_templates.get(industry, {})
         hooks = self.viral_hooks.get(hook_type, [])
         
-        content_ideas = []
+        # Hooks are rendered once and reused across every template
+        rendered_hooks = self._render_hooks(hooks, topic)
+        
+        contents = []
+        categories = []
+        missing_slots = []
         
         for category, templates in industry_templates.items():
             for template in templates:
+                template_slots = compile_template(template).slot_names
                 # Apply viral hooks
-                for hook in hooks:
-                    content = self._apply_hook(hook, template, topic)
+                for hook, hook_missing in rendered_hooks:
+                    content = hook + "\n\n" + template
                     
                     # Add engagement elements
-                    content = self._add_engagement_elements(content)
+                    contents.append(self._add_engagement_elements(content, rng))
+                    categories.append(category)
+                    missing_slots.append(unfilled_slots(hook_missing, template_slots))
+        
+        # Score all generated ideas in one batch
+        analyses = self._analyze_engagement_batch(contents)
+        
+        return [
+            {
+                'content': content,
+                'category': category,
+                'hook_type': hook_type,
+                'engagement_elements': analysis,
+                'unfilled_slots': missing
+            }
+            for content, category, analysis, missing in zip(contents, categories, analyses, missing_slots)
+        ]
+    
+    def iter_viral_content(self, industry: str, topic: str, hook_type: str, rng=random) -> Iterator[Dict]:
+        """Lazily yield viral content ideas, one template x hook combination at a time"""
+        industry_templates = self.content_templates.get(industry, {})
+        hooks = self.viral_hooks.get(hook_type, [])
+        
+        rendered_hooks = self._render_hooks(hooks, topic)
+        
+        for category, templates in industry_templates.items():
+            for template in templates:
+                template_slots = compile_template(template).slot_names
+                for hook, hook_missing in rendered_hooks:
+                    content = self._add_engagement_elements(hook + "\n\n" + template, rng)
                     
-                    content_ideas.append({
+                    yield {
                         'content': content,
                         'category': category,
                         'hook_type': hook_type,
-                        'engagement_elements': self._analyze_engagement_elements(content)
-                    })
+                        'engagement_elements': self._analyze_engagement_elements(content),
+                        'unfilled_slots': unfilled_slots(hook_missing, template_slots)
+                    }
+    
+    def top_viral_content(
+        self,
+        industry: str,
+        topic: str,
+        hook_type: str,
+        k: int = 10,
+        cursor: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Return the k best ideas by engagement_score and a cursor for the next page.
+        
+        Ideas are streamed through a bounded heap, so memory is O(k) however
+        many templates and hooks exist. The cursor pins the RNG seed used for
+        the engagement elements, so every page ranks the same set of ideas.
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        
+        if cursor:
+            seed, last_score, last_index = _decode_cursor(cursor)
+            after = (last_score, -last_index)
+        else:
+            after = None
+            if seed is None:
+                seed = random.getrandbits(32)
+        
+        # Min-heap of the best k (score, -index) ranks seen so far
+        heap = []
+        remaining = 0
+        ideas = self.iter_viral_content(industry, topic, hook_type, random.Random(seed))
+        for index, idea in enumerate(ideas):
+            rank = (engagement_score(idea['engagement_elements']), -index)
+            if after is not None and rank >= after:
+                continue  # Served on an earlier page
+            
+            remaining += 1
+            if len(heap) < k:
+                heapq.heappush(heap, (rank, idea))
+            elif rank > heap[0][0]:
+                heapq.heapreplace(heap, (rank, idea))
+        
+        page = sorted(heap, key=lambda entry: entry[0], reverse=True)
+        next_cursor = None
+        if remaining > len(page):
+            (score, negative_index), _ = page[-1]
+            next_cursor = _encode_cursor(seed, score, -negative_index)
         
-        return content_ideas
+        return {
+            'ideas': [dict(idea, score=rank[0]) for rank, idea in page],
+            'next_cursor': next_cursor
+        }
+    
+    def _render_hooks(self, hooks: List[str], topic: str) -> List[Tuple[str, List[str]]]:
+        """Render each hook for a topic, paired with the slots it leaves unfilled"""
+        values = {'topic': topic}
+        compiled = [compile_template(hook) for hook in hooks]
+        return [(hook.render(values), hook.missing(values)) for hook in compiled]
     
     def _apply_hook(self, hook: str, template: str, topic: str) -> str:
         """Apply viral hook to template"""
         # Replace placeholders
-        content = hook.replace('[topic]', topic)
+        content = compile_template(hook).render({'topic': topic})
         content = content + "\n\n" + template
         
         return content
     
-    def _add_engagement_elements(self, content: str) -> str:
+    def _add_engagement_elements(self, content: str, rng=random) -> str:
         """Add engagement-boosting elements"""
         elements = {
             'questions': [
@@ -161,65 +305,54 @@ class ViralContentGenerator:
         }
         
         # Add question
-        content += f"\n\n{random.choice(elements['questions'])}"
+        content += f"\n\n{rng.choice(elements['questions'])}"
         
         # Add call-to-action
-        content += f"\n\n{random.choice(elements['calls_to_action'])}"
+        content += f"\n\n{rng.choice(elements['calls_to_action'])}"
         
         # Add emojis if not present
-        if len(re.findall(r'[\U0001F300-\U0001F999]', content)) < 3:
-            content = content + " " + " ".join(random.sample(elements['emojis'], 2))
+        if len(EMOJI_RE.findall(content)) < 3:
+            content = content + " " + " ".join(rng.sample(elements['emojis'], 2))
         
         return content
     
-    def _analyze_engagement_elements(self, content: str) -> Dict:
+    def _analyze_engagement_elements(self, content: str, features: Optional[TextFeatures] = None) -> Dict:
         """Analyze engagement elements in content"""
+        features = features or extract_features(content)
         return {
-            'questions': len(re.findall(r'\?', content)),
-            'calls_to_action': len(re.findall(r'(like|comment|share|save|tag|try)', content.lower())),
-            'emojis': len(re.findall(r'[\U0001F300-\U0001F999]', content)),
-            'sentiment': TextBlob(content).sentiment.polarity,
-            'length': len(content)
+            'questions': features.questions,
+            'calls_to_action': features.calls_to_action(VIRAL_CTA),
+            'emojis': features.emojis,
+            'sentiment': _sentiment(content),
+            'length': features.length
         }
     
+    def _analyze_engagement_batch(self, contents: List[str]) -> List[Dict]:
+        """Analyze engagement elements for a batch of posts in one feature-extraction pass"""
+        return [
+            self._analyze_engagement_elements(content, features)
+            for content, features in zip(contents, extract_features_batch(contents))
+        ]
+    
     def generate_hashtag_groups(self, industry: str, content: str) -> Dict[str, List[str]]:
         """Generate grouped hashtags for the content"""
-        # Extract keywords
-        words = nltk.word_tokenize(content.lower())
-        keywords = [word for word, tag in nltk.pos_tag(words) 
-                   if tag in ['NN', 'NNS', 'JJ', 'VB']]
-        
-        # Industry-specific hashtags
-        industry_hashtags = {
-            'restaurant': {
-                'general': ['#foodie', '#instafood', '#foodstagram'],
-                'quality': ['#homemade', '#fresh', '#delicious'],
-                'experience': ['#foodlover', '#foodphotography', '#yummy']
-            },
-            'retail': {
-                'general': ['#fashion', '#style', '#shopping'],
-                'quality': ['#trendy', '#luxury', '#quality'],
-                'experience': ['#shoplocal', '#boutique', '#musthave']
-            },
-            'fitness': {
-                'general': ['#fitness', '#workout', '#gym'],
-                'quality': ['#strong', '#healthy', '#fit'],
-                'experience': ['#motivation', '#fitnessmotivation', '#lifestyle']
-            }
-        }
-        
-        # Get industry hashtags
-        hashtag_groups = industry_hashtags.get(industry, {})
-        
-        # Add content-specific hashtags
-        content_hashtags = [f"#{keyword}" for keyword in set(keywords) 
-                          if len(keyword) > 3][:5]
-        hashtag_groups['content'] = content_hashtags
-        
-        return hashtag_groups
+        return self.hashtag_service.generate_hashtag_groups(industry, content)
     
-    def generate_content_series(self, industry: str, topic: str, duration: int) -> List[Dict]:
-        """Generate a series of related content posts"""
+    def generate_content_series(
+        self,
+        industry: str,
+        topic: str,
+        duration: int,
+        seed: Optional[int] = None
+    ) -> List[Dict]:
+        """Generate a series of related content posts; a seed makes the result reproducible and cacheable"""
+        return self._cached(
+            ('series', industry, topic, None, duration, seed),
+            seed,
+            lambda rng: self._generate_content_series(industry, topic, duration, rng)
+        )
+    
+    def _generate_content_series(self, industry: str, topic: str, duration: int, rng: random.Random) -> List[Dict]:
         series = []
         
         # Series templates
@@ -276,23 +409,45 @@ class ViralContentGenerator:
         
         # Get relevant templates
         industry_series = series_templates.get(industry, {})
-        series_type = random.choice(list(industry_series.keys()))
+        if not industry_series:
+            # Unknown industry: no series, like generate_viral_content returns no ideas
+            return series
+        series_type = rng.choice(list(industry_series.keys()))
         templates = industry_series[series_type]
         
         # Generate series
         for i, template in enumerate(templates[:duration]):
             content = self._apply_hook(
-                random.choice(self.viral_hooks['value']),
+                rng.choice(self.viral_hooks['value']),
                 template,
                 topic
             )
-            content = self._add_engagement_elements(content)
+            content = self._add_engagement_elements(content, rng)
             
             series.append({
                 'day': i + 1,
                 'content': content,
-                'type': series_type,
-                'hashtags': self.generate_hashtag_groups(industry, content)
+                'type': series_type
             })
         
+        # Tag every day's content in one batch
+        hashtag_groups = self.hashtag_service.generate_hashtag_groups_batch(
+            industry, [post['content'] for post in series]
+        )
+        for post, hashtags in zip(series, hashtag_groups):
+            post['hashtags'] = hashtags
+        
         return series
+    
+    def _cached(self, key: Tuple, seed: Optional[int], build: Callable[[random.Random], List[Dict]]) -> List[Dict]:
+        """Serve seeded requests from the shared result cache; unseeded ones are always generated fresh"""
+        if seed is None:
+            return build(random.Random())
+        
+        result = _result_cache.get(key)
+        if result is None:
+            result = build(random.Random(seed))
+            _result_cache.put(key, result)
+        
+        # Callers may mutate the ideas, so never hand out the cached objects
+        return copy.deepcopy(result)
@@ -1,14 +1,29 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 from datetime import datetime
-from ..models.workflow import Workflow, Campaign
-from ..schemas.workflow import WorkflowCreate, WorkflowUpdate, CampaignCreate
-from ..utils.content_analyzer import analyze_content
-from ..utils.scheduler import schedule_content
+from ..models.workflow import Workflow, Campaign, PublishAttempt
+from ..schemas.workflow import WorkflowCreate, WorkflowUpdate, WorkflowInDB, CampaignCreate, WorkflowBulkItem, WorkflowStatus
+from ..utils.content_analyzer import analyze_content, analyze_content_batch, same_content
+from ..utils.pagination import DEFAULT_PAGE_SIZE, keyset_page, split_page
+from ..utils.response_cache import response_cache
+from ..utils.scheduler import cancel_content, dispatcher, replay_content, schedule_content, schedule_content_batch
+from ..utils.status_writer import status_writer
+
+# Columns behind WorkflowInDB, for listings serialized straight from the rows
+WORKFLOW_COLUMNS = [Workflow.__table__.c[name] for name in WorkflowInDB.model_fields]
+EXPORT_BATCH_SIZE = 1000
+
+def workflow_columns(fields: Optional[Sequence[str]] = None) -> list:
+    """Columns to select for a sparse fieldset: the requested fields and the id, or all of WorkflowInDB"""
+    if not fields:
+        return WORKFLOW_COLUMNS
+    return [Workflow.__table__.c[name] for name in dict.fromkeys(["id", *fields])]
 
 class WorkflowService:
     @staticmethod
-    async def create_workflow(db: Session, workflow: WorkflowCreate) -> Workflow:
+    async def create_workflow(db: AsyncSession, workflow: WorkflowCreate) -> Workflow:
         # Analyze content for optimization
         analyzed_content = await analyze_content(workflow.content)
         
@@ -20,115 +35,326 @@ class WorkflowService:
             platform=workflow.platform,
             content=analyzed_content,
             schedule_time=workflow.schedule_time,
-            metadata=workflow.metadata or {}
+            meta=workflow.metadata or {}
         )
         
         db.add(db_workflow)
-        db.commit()
-        db.refresh(db_workflow)
+        await db.flush()
         
-        # Schedule the content if it's ready
+        # Schedule the content if it's ready; the job row commits with the workflow
+        job = None
         if workflow.schedule_time:
-            await schedule_content(db_workflow)
+            job = await schedule_content(db, db_workflow)
         
+        await db.commit()
+        if job is not None:
+            dispatcher.schedule(*job)
+        await db.refresh(db_workflow)
         return db_workflow
 
     @staticmethod
-    def get_workflow(db: Session, workflow_id: int) -> Optional[Workflow]:
-        return db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    async def create_workflows(db: AsyncSession, workflows: List[WorkflowCreate]) -> List[WorkflowBulkItem]:
+        """
+        Create many workflows in one transaction: one analysis pass, one
+        insert flush, one scheduler registration and a single commit.
+        Items pointing at an unknown campaign are reported and skipped.
+        """
+        campaign_ids = {workflow.campaign_id for workflow in workflows}
+        known = set(await db.scalars(select(Campaign.id).where(Campaign.id.in_(campaign_ids))))
+
+        results = [WorkflowBulkItem(index=index) for index in range(len(workflows))]
+        accepted = []
+        for item, workflow in zip(results, workflows):
+            if workflow.campaign_id in known:
+                accepted.append((item, workflow))
+            else:
+                item.error = "Campaign not found"
+        if not accepted:
+            return results
+
+        analyzed = await analyze_content_batch([workflow.content for _, workflow in accepted])
+        db_workflows = [
+            Workflow(
+                campaign_id=workflow.campaign_id,
+                content_type=workflow.content_type,
+                status="draft",
+                platform=workflow.platform,
+                content=content,
+                schedule_time=workflow.schedule_time,
+                meta=workflow.metadata or {}
+            )
+            for (_, workflow), content in zip(accepted, analyzed)
+        ]
+        db.add_all(db_workflows)
+        await db.flush()
+
+        # Ids exist after the flush, so the whole batch is scheduled before the single commit
+        scheduled, jobs = await schedule_content_batch(
+            db,
+            [db_workflow for db_workflow in db_workflows if db_workflow.schedule_time]
+        )
+        scheduled = iter(scheduled)
+        for (item, _), db_workflow in zip(accepted, db_workflows):
+            item.id = db_workflow.id
+            if db_workflow.schedule_time and not next(scheduled):
+                item.error = db_workflow.meta.get("error")
+        await db.commit()
+        dispatcher.schedule_many(jobs)
+
+        for (item, _), db_workflow in zip(accepted, db_workflows):
+            item.status = WorkflowStatus(db_workflow.status)
+        return results
+
+    @staticmethod
+    async def get_workflow(db: AsyncSession, workflow_id: int) -> Optional[Workflow]:
+        return await db.get(Workflow, workflow_id)
+
+    @staticmethod
+    async def get_workflow_row(
+        db: AsyncSession,
+        workflow_id: int,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """One workflow as a dict of the requested WorkflowInDB columns, without loading the rest"""
+        row = (await db.execute(select(*workflow_columns(fields)).where(Workflow.id == workflow_id))).first()
+        return row._asdict() if row else None
 
     @staticmethod
-    def get_workflows(
-        db: Session,
-        skip: int = 0,
-        limit: int = 100,
+    async def get_workflow_version(db: AsyncSession, workflow_id: int) -> Optional[datetime]:
+        """The workflow's updated_at, read by primary key without loading the row; None if it does not exist"""
+        return await db.scalar(select(Workflow.updated_at).where(Workflow.id == workflow_id))
+
+    @staticmethod
+    async def get_workflows(
+        db: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
         campaign_id: Optional[int] = None,
         status: Optional[str] = None
-    ) -> List[Workflow]:
-        query = db.query(Workflow)
-        
+    ) -> Tuple[List[Workflow], Optional[str]]:
+        """One page of workflows in (schedule_time, id) order and the cursor for the next"""
+        query = WorkflowService._filter(select(Workflow), campaign_id, status)
+        query = keyset_page(query, Workflow.schedule_time, Workflow.id, limit, cursor)
+        return split_page(await db.scalars(query), limit, "schedule_time")
+
+    @staticmethod
+    async def get_workflow_rows(
+        db: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        campaign_id: Optional[int] = None,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Same page as get_workflows, as plain dicts of the WorkflowInDB columns
+        (or just the id and `fields`). Nothing is loaded into the session, so
+        listings can be encoded as they come.
+        """
+        columns = workflow_columns(fields)
+        names = [column.name for column in columns]
+        if "schedule_time" not in names:
+            # The cursor needs the sort key even when the response leaves it out
+            columns = [*columns, Workflow.schedule_time]
+        query = WorkflowService._filter(select(*columns), campaign_id, status)
+        query = keyset_page(query, Workflow.schedule_time, Workflow.id, limit, cursor)
+        rows, next_cursor = split_page(await db.execute(query), limit, "schedule_time")
+        return [dict(zip(names, row)) for row in rows], next_cursor
+
+    @staticmethod
+    async def stream_workflows(
+        db: AsyncSession,
+        campaign_id: Optional[int] = None,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Every matching workflow in id order, fetched through a server-side cursor `batch_size` rows at a time"""
+        query = WorkflowService._filter(select(*workflow_columns(fields)), campaign_id, status).order_by(Workflow.id)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield [row._asdict() for row in rows]
+
+    @staticmethod
+    def _filter(query, campaign_id: Optional[int], status: Optional[str]):
         if campaign_id:
-            query = query.filter(Workflow.campaign_id == campaign_id)
+            query = query.where(Workflow.campaign_id == campaign_id)
         if status:
-            query = query.filter(Workflow.status == status)
-            
-        return query.offset(skip).limit(limit).all()
+            query = query.where(Workflow.status == status)
+        return query
 
     @staticmethod
     async def update_workflow(
-        db: Session,
+        db: AsyncSession,
         workflow_id: int,
         workflow_update: WorkflowUpdate
     ) -> Optional[Workflow]:
-        db_workflow = WorkflowService.get_workflow(db, workflow_id)
+        db_workflow = await WorkflowService.get_workflow(db, workflow_id)
         if not db_workflow:
             return None
             
         update_data = workflow_update.dict(exclude_unset=True)
         
-        # If content is being updated, re-analyze it
+        # If content is being updated, re-analyze it; resubmitting the same content keeps its analysis
         if "content" in update_data:
-            update_data["content"] = await analyze_content(update_data["content"])
+            if same_content(db_workflow.content, update_data["content"]):
+                del update_data["content"]
+            else:
+                update_data["content"] = await analyze_content(update_data["content"])
         
         for field, value in update_data.items():
-            setattr(db_workflow, field, value)
+            setattr(db_workflow, "meta" if field == "metadata" else field, value)
+        # An explicit status wins over a publish outcome still waiting to be written
+        if "status" in update_data:
+            status_writer.discard(workflow_id)
         
         # If schedule time is updated, reschedule the content
+        job = None
         if "schedule_time" in update_data:
-            await schedule_content(db_workflow)
+            job = await schedule_content(db, db_workflow)
         
-        db.commit()
-        db.refresh(db_workflow)
+        await db.commit()
+        if job is not None:
+            dispatcher.schedule(*job)
+        response_cache.invalidate("workflow", workflow_id)
+        response_cache.invalidate("campaign", db_workflow.campaign_id)
+        await db.refresh(db_workflow)
         return db_workflow
 
     @staticmethod
-    def delete_workflow(db: Session, workflow_id: int) -> bool:
-        db_workflow = WorkflowService.get_workflow(db, workflow_id)
+    async def delete_workflow(db: AsyncSession, workflow_id: int) -> bool:
+        db_workflow = await WorkflowService.get_workflow(db, workflow_id)
         if not db_workflow:
             return False
             
-        db.delete(db_workflow)
-        db.commit()
+        await cancel_content(db, workflow_id)
+        status_writer.discard(workflow_id, attempts=True)
+        await db.execute(delete(PublishAttempt).where(PublishAttempt.workflow_id == workflow_id))
+        await db.delete(db_workflow)
+        await db.commit()
+        response_cache.invalidate("workflow", workflow_id)
+        response_cache.invalidate("campaign", db_workflow.campaign_id)
         return True
 
+    @staticmethod
+    async def get_publish_attempts(db: AsyncSession, workflow_id: int) -> List[PublishAttempt]:
+        result = await db.scalars(
+            select(PublishAttempt)
+            .where(PublishAttempt.workflow_id == workflow_id)
+            .order_by(PublishAttempt.id)
+        )
+        return list(result)
+
+    @staticmethod
+    async def replay_dead_letters(
+        db: AsyncSession,
+        workflow_ids: Optional[List[int]] = None
+    ) -> List[int]:
+        """Re-queue dead-lettered workflows (all of them by default) and return their ids"""
+        query = select(Workflow).where(Workflow.status == "dead_letter")
+        if workflow_ids is not None:
+            query = query.where(Workflow.id.in_(workflow_ids))
+        workflows = list(await db.scalars(query.order_by(Workflow.id)))
+        if workflows:
+            jobs = await replay_content(db, workflows)
+            await db.commit()
+            dispatcher.schedule_many(jobs)
+        return [workflow.id for workflow in workflows]
+
 class CampaignService:
+    # CampaignInDB nests the workflows and async sessions cannot lazy load,
+    # so every campaign read fetches them up front in one extra query
+    _with_workflows = selectinload(Campaign.workflows)
+
     @staticmethod
-    def create_campaign(db: Session, campaign: CampaignCreate) -> Campaign:
+    async def create_campaign(db: AsyncSession, campaign: CampaignCreate) -> Campaign:
         db_campaign = Campaign(**campaign.dict())
         db.add(db_campaign)
-        db.commit()
-        db.refresh(db_campaign)
+        await db.commit()
+        await db.refresh(db_campaign, ["workflows"])
         return db_campaign
 
     @staticmethod
-    def get_campaign(db: Session, campaign_id: int) -> Optional[Campaign]:
-        return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    def _options(with_workflows: bool, fields: Optional[Sequence[str]]) -> list:
+        options = [CampaignService._with_workflows] if with_workflows else []
+        if fields:
+            # Keyset paging reads start_date off the last row, so it always loads
+            options.append(load_only(Campaign.start_date, *(getattr(Campaign, name) for name in fields)))
+        return options
 
     @staticmethod
-    def get_campaigns(
-        db: Session,
-        skip: int = 0,
-        limit: int = 100,
-        status: Optional[str] = None
-    ) -> List[Campaign]:
-        query = db.query(Campaign)
+    async def get_campaign(
+        db: AsyncSession,
+        campaign_id: int,
+        with_workflows: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Campaign]:
+        """The campaign, with only `fields` (and its keys) loaded when given"""
+        return await db.get(Campaign, campaign_id, options=CampaignService._options(with_workflows, fields))
+
+    @staticmethod
+    async def get_campaign_version(db: AsyncSession, campaign_id: int) -> Optional[Tuple]:
+        """
+        Version of a campaign response: its own updated_at plus the count and
+        latest updated_at of its workflows, which the response can nest.
+        None if the campaign does not exist.
+        """
+        row = (await db.execute(
+            select(Campaign.updated_at, func.count(Workflow.id), func.max(Workflow.updated_at))
+            .outerjoin(Workflow, Workflow.campaign_id == Campaign.id)
+            .where(Campaign.id == campaign_id)
+            .group_by(Campaign.id)
+        )).first()
+        return tuple(row) if row else None
+
+    @staticmethod
+    async def get_campaigns(
+        db: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        with_workflows: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Campaign], Optional[str]]:
+        """One page of campaigns in (start_date, id) order and the cursor for the next"""
+        query = select(Campaign).options(*CampaignService._options(with_workflows, fields))
         if status:
-            query = query.filter(Campaign.status == status)
-        return query.offset(skip).limit(limit).all()
+            query = query.where(Campaign.status == status)
+        query = keyset_page(query, Campaign.start_date, Campaign.id, limit, cursor)
+        return split_page(await db.scalars(query), limit, "start_date")
+
+    @staticmethod
+    async def get_workflow_counts(
+        db: AsyncSession,
+        campaign_ids: List[int]
+    ) -> Dict[int, Dict[str, int]]:
+        """Workflow counts by status for each campaign, in one grouped query"""
+        counts = {campaign_id: {} for campaign_id in campaign_ids}
+        if not campaign_ids:
+            return counts
+        result = await db.execute(
+            select(Workflow.campaign_id, Workflow.status, func.count())
+            .where(Workflow.campaign_id.in_(campaign_ids))
+            .group_by(Workflow.campaign_id, Workflow.status)
+        )
+        for campaign_id, status, count in result:
+            counts[campaign_id][status.value if status else "unknown"] = count
+        return counts
 
     @staticmethod
-    def update_campaign(
-        db: Session,
+    async def update_campaign(
+        db: AsyncSession,
         campaign_id: int,
         campaign_data: Dict[str, Any]
     ) -> Optional[Campaign]:
-        db_campaign = CampaignService.get_campaign(db, campaign_id)
+        db_campaign = await CampaignService.get_campaign(db, campaign_id)
         if not db_campaign:
             return None
             
         for field, value in campaign_data.items():
             setattr(db_campaign, field, value)
             
-        db.commit()
-        db.refresh(db_campaign)
+        await db.commit()
+        response_cache.invalidate("campaign", campaign_id)
+        await db.refresh(db_campaign, ["workflows"])
         return db_campaign
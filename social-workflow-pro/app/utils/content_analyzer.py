@@ -1,6 +1,15 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
 import aiohttp
 from ..core.config import settings
+from .cache import LRUCache, SQLiteCache
+from .text_features import extract_features
+
+# Metrics JSON by content hash (decoding gives each caller its own copy);
+# the SQLite tier, when configured, survives restarts
+_analysis_cache = LRUCache(maxsize=settings.ANALYSIS_CACHE_SIZE)
+_analysis_store = SQLiteCache(settings.ANALYSIS_CACHE_PATH, 'content_analysis') if settings.ANALYSIS_CACHE_PATH else None
 
 async def analyze_content(content: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -14,18 +23,68 @@ async def analyze_content(content: Dict[str, Any]) -> Dict[str, Any]:
     5. Engagement prediction
     """
     
-    analyzed_content = content.copy()
-    
-    # Add content quality metrics
-    analyzed_content["metrics"] = {
-        "quality_score": calculate_quality_score(content),
+    return (await analyze_content_batch([content]))[0]
+
+async def analyze_content_batch(contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Analyze many content payloads, in order. Cached results are reused and
+    each distinct miss is scored once. The metrics are a few string passes,
+    cheaper inline than a round trip to the analysis worker pool.
+    """
+    keys = [content_key(content) for content in contents]
+    metrics = {}
+    misses = {}
+    for key, content in zip(keys, contents):
+        if key in metrics or key in misses:
+            continue
+        cached = _cached_metrics(key)
+        if cached is None:
+            misses[key] = content
+        else:
+            metrics[key] = cached
+
+    for key, content in misses.items():
+        metrics[key] = json.dumps(_compute_metrics(content))
+        _analysis_cache.put(key, metrics[key])
+        if _analysis_store is not None:
+            _analysis_store.put(key, metrics[key])
+
+    return [{**content, "metrics": json.loads(metrics[key])} for key, content in zip(keys, contents)]
+
+def analysis_cache_stats() -> Dict[str, float]:
+    return _analysis_cache.stats()
+
+def content_key(content: Dict[str, Any]) -> str:
+    """
+    Hash of the canonical JSON of `content`, ignoring any previous analysis,
+    so equal payloads share a key whatever their key order.
+    """
+    payload = {key: value for key, value in content.items() if key != "metrics"}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def same_content(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> bool:
+    """Whether `new` would analyze exactly like the stored `old` content"""
+    return old is not None and "metrics" in old and content_key(old) == content_key(new)
+
+def _cached_metrics(key: str) -> Optional[str]:
+    metrics = _analysis_cache.get(key)
+    if metrics is None and _analysis_store is not None:
+        metrics = _analysis_store.get(key)
+        if metrics is not None:
+            _analysis_cache.put(key, metrics)
+    return metrics
+
+def _compute_metrics(content: Dict[str, Any]) -> Dict[str, Any]:
+    # Content quality metrics; the quality score also drives the engagement prediction
+    quality_score = calculate_quality_score(content)
+    return {
+        "quality_score": quality_score,
         "sentiment_score": analyze_sentiment(content),
-        "engagement_prediction": predict_engagement(content),
+        "engagement_prediction": predict_engagement(content, quality_score),
         "optimal_hashtags": optimize_hashtags(content),
         "best_posting_time": predict_best_posting_time(content)
     }
-    
-    return analyzed_content
 
 def calculate_quality_score(content: Dict[str, Any]) -> float:
     """Calculate content quality score based on various factors"""
@@ -33,9 +92,9 @@ def calculate_quality_score(content: Dict[str, Any]) -> float:
     
     if "text" in content:
         # Text analysis
-        text = content["text"]
-        score += len(text.split()) * 0.1  # Length factor
-        score += count_unique_words(text) * 0.2  # Vocabulary diversity
+        features = extract_features(content["text"])
+        score += features.words * 0.1  # Length factor
+        score += features.unique_words * 0.2  # Vocabulary diversity
         
     if "media" in content:
         # Media analysis
@@ -68,9 +127,11 @@ def analyze_sentiment(content: Dict[str, Any]) -> float:
         
     return (positive_count - negative_count) / total
 
-def predict_engagement(content: Dict[str, Any]) -> Dict[str, float]:
-    """Predict potential engagement metrics"""
-    base_score = calculate_quality_score(content) / 10.0
+def predict_engagement(content: Dict[str, Any], quality_score: Optional[float] = None) -> Dict[str, float]:
+    """Predict potential engagement metrics, reusing an already computed quality score"""
+    if quality_score is None:
+        quality_score = calculate_quality_score(content)
+    base_score = quality_score / 10.0
     
     return {
         "likes_prediction": base_score * 1000,
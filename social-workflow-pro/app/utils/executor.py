@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+from ..core.config import settings
+from ..core.nlp import get_pos_tagger, get_spacy, get_vader
+
+logger = logging.getLogger(__name__)
+
+# Loaded once in every worker as it starts, so no request pays for a model load
+WARMUP = (get_spacy, get_vader, get_pos_tagger)
+
+class ExecutorBusy(RuntimeError):
+    """The analysis queue stayed full for the whole submit timeout"""
+
+def _warm_worker(loaders: Sequence[Callable[[], Any]]) -> None:
+    for loader in loaders:
+        try:
+            loader()
+        except (ImportError, LookupError, OSError) as e:
+            # Optional models may be absent; tasks that need them fail on their own
+            logger.warning("Worker %d could not preload %s: %s", os.getpid(), loader.__name__, e)
+
+def _apply_batch(fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+    return [fn(item) for item in items]
+
+def _ready() -> int:
+    return os.getpid()
+
+class AnalysisExecutor:
+    """
+    Warm process pool for CPU-bound analysis, awaitable from the event loop.
+
+    At most `max_pending` tasks (single calls or batch chunks) are queued or
+    running at once. A submission that finds the queue full waits up to
+    `submit_timeout` seconds for room and then raises ExecutorBusy, so
+    overload turns into fast 503s instead of an unbounded backlog. With
+    `workers=0` everything runs inline on the caller's thread.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        submit_timeout: Optional[float] = None,
+        warmup: Sequence[Callable[[], Any]] = WARMUP
+    ):
+        if workers is None:
+            workers = settings.ANALYSIS_WORKERS
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        self.workers = workers
+        self.max_pending = max_pending or settings.ANALYSIS_MAX_PENDING
+        self.submit_timeout = settings.ANALYSIS_SUBMIT_TIMEOUT_SECONDS if submit_timeout is None else submit_timeout
+        self.warmup = tuple(warmup)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned rather than forked: the parent runs an event loop and database threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                initargs=(self.warmup,)
+            )
+        return self._pool
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def start(self) -> None:
+        """Start every worker and wait for its models to load"""
+        if self.workers:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` in a worker; `fn` and its arguments must be picklable"""
+        if not self.workers:
+            return fn(*args)
+        await self._acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        finally:
+            self.slots.release()
+
+    async def map(self, fn: Callable[[Any], Any], items: Sequence[Any], chunk_size: Optional[int] = None) -> List[Any]:
+        """
+        `[fn(item) for item in items]` spread across the workers in chunks,
+        each chunk one task, so a batch costs a few round trips rather than one per item.
+        """
+        if not items:
+            return []
+        if not self.workers:
+            return _apply_batch(fn, items)
+        chunk_size = chunk_size or math.ceil(len(items) / (self.workers * 4))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = await asyncio.gather(*(self.run(_apply_batch, fn, chunk) for chunk in chunks))
+        return [result for chunk in results for result in chunk]
+
+    async def _acquire(self) -> None:
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.submit_timeout)
+        except asyncio.TimeoutError:
+            raise ExecutorBusy(f"Analysis queue is full ({self.max_pending} tasks pending)") from None
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+analysis_executor = AnalysisExecutor()
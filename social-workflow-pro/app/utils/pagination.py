@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, and_, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    """Opaque cursor pointing just past the row with this (sort value, id)"""
+    payload = [sort_value.isoformat() if sort_value is not None else None, row_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def keyset_page(query: Select, sort_column, id_column, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Order `query` by (sort_column, id) and seek past `cursor`.
+
+    The seek is a row-value comparison, which the database answers with a
+    range scan on a (filters..., sort_column, id) index, so every page costs
+    the same as the first. Rows without a sort value come first. One extra
+    row is fetched so `split_page` can tell whether another page exists.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            query = query.where(or_(
+                and_(sort_column.is_(None), id_column > row_id),
+                sort_column.is_not(None)
+            ))
+        else:
+            query = query.where(tuple_(sort_column, id_column) > tuple_(sort_value, row_id))
+    return query.order_by(sort_column.asc().nulls_first(), id_column).limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int, sort_attr: str) -> Tuple[List[Any], Optional[str]]:
+    """Trim the lookahead row from a `keyset_page` result and build the next cursor"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), last.id)
@@ -0,0 +1,165 @@
+from typing import Any, Dict, Optional
+import asyncio
+import time
+import aiohttp
+from ..core.config import settings
+
+DEFAULT_CONCURRENCY = 5
+DEFAULT_RATE_LIMIT = 10.0
+
+class PublishError(Exception):
+    """A platform rejected or failed a publish request"""
+
+    def __init__(self, platform: str, status: Optional[int], message: str, retryable: Optional[bool] = None):
+        super().__init__(f"{platform} publish failed ({status}): {message}")
+        self.platform = platform
+        self.status = status
+        self._retryable = retryable
+
+    @property
+    def retryable(self) -> bool:
+        if self._retryable is not None:
+            return self._retryable
+        # Network errors, throttling and server errors are transient; other 4xx will fail again
+        return self.status is None or self.status == 429 or self.status >= 500
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursting up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out first come, first served
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class PublisherPool:
+    """
+    Shared publishing client. Each platform gets its own concurrency limit and
+    token bucket, and every request goes through one pooled aiohttp session.
+    A request first takes a concurrency slot and then a token, so queued
+    requests cannot save up tokens and burst past the rate limit.
+    """
+
+    def __init__(
+        self,
+        api_urls: Optional[Dict[str, str]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None
+    ):
+        self.api_urls = settings.PLATFORM_API_URLS if api_urls is None else api_urls
+        self.concurrency = settings.PUBLISH_CONCURRENCY if concurrency is None else concurrency
+        self.rate_limits = settings.PUBLISH_RATE_LIMITS if rate_limits is None else rate_limits
+        self.timeout = timeout or settings.PUBLISH_TIMEOUT_SECONDS
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _limits(self, platform: str):
+        if platform not in self._slots:
+            self._slots[platform] = asyncio.Semaphore(self.concurrency.get(platform, DEFAULT_CONCURRENCY))
+            self._buckets[platform] = TokenBucket(self.rate_limits.get(platform, DEFAULT_RATE_LIMIT))
+        return self._slots[platform], self._buckets[platform]
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=sum(self.concurrency.values()) or 100)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def publish(
+        self,
+        platform: str,
+        content: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> bool:
+        """
+        Publish within the platform's concurrency and rate limits. The key is
+        sent as an Idempotency-Key header so a retried request is not posted twice.
+        Returns True once published; every failure raises PublishError.
+        """
+        platform = getattr(platform, "value", platform)
+        slots, bucket = self._limits(platform)
+        async with slots:
+            await bucket.acquire()
+            return await self._send(platform, content, idempotency_key)
+
+    async def _send(self, platform: str, content: Dict[str, Any], idempotency_key: Optional[str]) -> bool:
+        url = self.api_urls.get(platform)
+        if url is None:
+            if platform not in PLATFORM_STUBS:
+                raise PublishError(platform, None, "no API URL configured", retryable=False)
+            if not await PLATFORM_STUBS[platform](content):
+                raise PublishError(platform, None, "publisher reported a failure")
+            return True
+
+        headers = {}
+        token = PLATFORM_TOKENS.get(platform)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        try:
+            async with self.session.post(f"{url.rstrip('/')}/posts", json=content, headers=headers) as response:
+                if response.status >= 400:
+                    raise PublishError(platform, response.status, await response.text())
+                return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise PublishError(platform, None, str(e) or type(e).__name__) from e
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+async def publish_to_twitter(content: dict) -> bool:
+    """Publish content to Twitter"""
+    # Implementation would use Twitter API
+    return True
+
+async def publish_to_facebook(content: dict) -> bool:
+    """Publish content to Facebook"""
+    # Implementation would use Facebook API
+    return True
+
+async def publish_to_instagram(content: dict) -> bool:
+    """Publish content to Instagram"""
+    # Implementation would use Instagram API
+    return True
+
+async def publish_to_linkedin(content: dict) -> bool:
+    """Publish content to LinkedIn"""
+    # Implementation would use LinkedIn API
+    return True
+
+# Used for platforms without a configured API URL
+PLATFORM_STUBS = {
+    "twitter": publish_to_twitter,
+    "facebook": publish_to_facebook,
+    "instagram": publish_to_instagram,
+    "linkedin": publish_to_linkedin,
+}
+
+PLATFORM_TOKENS = {
+    "facebook": settings.FACEBOOK_ACCESS_TOKEN,
+    "linkedin": settings.LINKEDIN_ACCESS_TOKEN,
+}
+
+publisher_pool = PublisherPool()
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+import hashlib
+from ..core.config import settings
+from .cache import LRUCache
+
+class CachedResponse(NamedTuple):
+    version: Any
+    etag: str
+    body: bytes
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of single-entity reads, keyed by (kind, id).
+
+    Each entry holds one body per response variant, stamped with the entity's
+    version (its updated_at, or a tuple of them for responses that nest other
+    rows). A lookup with any other version is a miss, so a write the services
+    did not announce can cost a re-render but never serves a stale body.
+    Services still invalidate what they change, which frees the memory early.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._entries = LRUCache(maxsize=maxsize or settings.RESPONSE_CACHE_SIZE)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, kind: str, entity_id: int, version: Any, variant: Hashable = None) -> Optional[CachedResponse]:
+        variants = self._entries.get((kind, entity_id))
+        cached = variants.get(variant) if variants else None
+        if cached is None or cached.version != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached
+
+    def put(self, kind: str, entity_id: int, version: Any, body: bytes, variant: Hashable = None) -> CachedResponse:
+        # Strong validator: equal ETags mean byte-identical bodies
+        cached = CachedResponse(version, f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        variants = self._entries.get((kind, entity_id))
+        if variants is None:
+            variants = {}
+            self._entries.put((kind, entity_id), variants)
+        variants[variant] = cached
+        return cached
+
+    def invalidate(self, kind: str, *entity_ids: Optional[int]) -> None:
+        for entity_id in entity_ids:
+            if entity_id is not None:
+                self._entries.pop((kind, entity_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.not_modified = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for metrics; `not_modified` counts hits answered with a 304"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'entities': len(self._entries),
+            'maxsize': self._entries.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+response_cache = ResponseCache()
@@ -1,97 +1,331 @@
-from typing import Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
-from ..models.workflow import Workflow
+import heapq
+import itertools
+import logging
+import random
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.workflow import PublishAttempt, ScheduledJob, Workflow
 from ..core.config import settings
+from .publisher import PublishError, publisher_pool
+from .status_writer import status_writer
 
-async def schedule_content(workflow: Workflow) -> bool:
+logger = logging.getLogger(__name__)
+
+class PublishDispatcher:
+    """
+    One loop that publishes scheduled workflows as they fall due.
+
+    Pending jobs are rows in `scheduled_jobs`; the dispatcher keeps a min-heap
+    of (run_at, workflow_id, version) over them and sleeps until the earliest.
+    Rescheduling pushes a fresh entry under a new version and cancelling just
+    forgets the live version, both O(log n) at most. Superseded entries are
+    dropped lazily when they reach the top of the heap, or in bulk once they
+    outnumber the live ones.
+    """
+
+    def __init__(
+        self,
+        publish: Optional[Callable[[int], Awaitable[Optional[datetime]]]] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        self._publish = publish or publish_scheduled
+        self._max_in_flight = max_in_flight or settings.PUBLISH_MAX_IN_FLIGHT
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._live: Dict[int, int] = {}  # workflow_id -> version of its current heap entry
+        self._errors: Dict[int, int] = {}  # workflow_id -> publishes in a row that raised
+        self._versions = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, workflow_id: int) -> bool:
+        return workflow_id in self._live
+
+    def schedule(self, workflow_id: int, run_at: datetime) -> None:
+        """Register or move a job; any earlier entry for the workflow is superseded"""
+        version = next(self._versions)
+        self._live[workflow_id] = version
+        heapq.heappush(self._heap, (run_at, workflow_id, version))
+        if self._heap[0][2] == version:
+            self._wakeup.set()  # New earliest job, re-arm the timer
+        self._compact()
+
+    def schedule_many(self, jobs: Iterable[Tuple[int, datetime]]) -> None:
+        for workflow_id, run_at in jobs:
+            self.schedule(workflow_id, run_at)
+
+    def cancel(self, workflow_id: int) -> bool:
+        self._errors.pop(workflow_id, None)
+        return self._live.pop(workflow_id, None) is not None
+
+    def load(self, jobs: Iterable[Tuple[int, datetime]]) -> None:
+        """Replace the heap with the given jobs in O(n)"""
+        self._live = {}
+        self._heap = []
+        for workflow_id, run_at in jobs:
+            version = next(self._versions)
+            self._live[workflow_id] = version
+            self._heap.append((run_at, workflow_id, version))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    async def recover(self) -> int:
+        """Reload every pending job from the database; overdue ones fire right away"""
+        from ..db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(select(ScheduledJob.workflow_id, ScheduledJob.run_at))
+            self.load(rows.tuples())
+        return len(self)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        # Bound to the loop that runs the dispatcher, which after a restart may be a new one
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self._max_in_flight)
+        await self.recover()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Publish dispatcher started with %d pending jobs", len(self))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Publishes already under way finish; their job rows are cleared as they commit
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._live) + 1024:
+            self._heap = [entry for entry in self._heap if self._live.get(entry[1]) == entry[2]]
+            heapq.heapify(self._heap)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = None
+            while self._heap:
+                run_at, workflow_id, version = self._heap[0]
+                if self._live.get(workflow_id) != version:
+                    heapq.heappop(self._heap)
+                    continue
+                now = datetime.utcnow()
+                if run_at > now:
+                    delay = (run_at - now).total_seconds()
+                    break
+                heapq.heappop(self._heap)
+                del self._live[workflow_id]
+                # Bounded fan-out: a backlog of due jobs drains at max_in_flight at a time
+                await self._slots.acquire()
+                task = asyncio.create_task(self._fire(workflow_id))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, workflow_id: int) -> None:
+        try:
+            moved_to = await self._publish(workflow_id)
+            self._errors.pop(workflow_id, None)
+            if moved_to is not None and workflow_id not in self._live:
+                self.schedule(workflow_id, moved_to)
+        except Exception:
+            # E.g. the database was unavailable: the job row is untouched, so try
+            # again after a backoff rather than leaving it until the next restart
+            errors = self._errors[workflow_id] = self._errors.get(workflow_id, 0) + 1
+            logger.exception("Publishing workflow %s failed (%d in a row)", workflow_id, errors)
+            if workflow_id not in self._live:
+                self.schedule(workflow_id, datetime.utcnow() + timedelta(seconds=retry_delay(errors)))
+        finally:
+            self._slots.release()
+
+async def schedule_content(db: AsyncSession, workflow: Workflow) -> Optional[Tuple[int, datetime]]:
     """
     Schedule content for publishing across different platforms.
-    Handles the scheduling logic and sets up the publishing pipeline.
+    Records the job in `db` and returns it for `dispatcher.schedule` once the
+    caller has committed (None if it could not be scheduled); firing earlier
+    would find no job row and drop the publish.
     """
     try:
         # Validate scheduling time
         if workflow.schedule_time < datetime.utcnow():
             raise ValueError("Cannot schedule content in the past")
 
-        # Calculate delay until publishing
-        delay = (workflow.schedule_time - datetime.utcnow()).total_seconds()
-        
-        # Schedule the publishing task
-        asyncio.create_task(
-            publish_content_at_time(
-                workflow_id=workflow.id,
-                platform=workflow.platform,
-                content=workflow.content,
-                delay=delay
-            )
-        )
+        job = await db.scalar(select(ScheduledJob).where(ScheduledJob.workflow_id == workflow.id))
+        if job is None:
+            db.add(ScheduledJob(workflow_id=workflow.id, run_at=workflow.schedule_time))
+        else:
+            job.run_at = workflow.schedule_time
+        status_writer.discard(workflow.id)
         
         # Update workflow status
         workflow.status = "scheduled"
-        return True
+        return workflow.id, workflow.schedule_time
         
     except Exception as e:
+        await cancel_content(db, workflow.id)
         workflow.status = "failed"
-        workflow.metadata["error"] = str(e)
-        return False
+        # Plain JSON columns don't track in-place changes; assign a new dict
+        workflow.meta = {**(workflow.meta or {}), "error": str(e)}
+        return None
 
-async def publish_content_at_time(
-    workflow_id: int,
-    platform: str,
-    content: dict,
-    delay: float
-) -> None:
+async def schedule_content_batch(
+    db: AsyncSession,
+    workflows: List[Workflow]
+) -> Tuple[List[bool], List[Tuple[int, datetime]]]:
     """
-    Handles the actual content publishing after the scheduled delay.
+    Schedule many new workflows at once with one insert of job rows. Returns
+    whether each was scheduled, and the jobs for `dispatcher.schedule_many`
+    once the caller has committed.
     """
-    # Wait until scheduled time
-    await asyncio.sleep(delay)
-    
+    now = datetime.utcnow()
+    results = []
+    due = []
+    for workflow in workflows:
+        if workflow.schedule_time < now:
+            workflow.status = "failed"
+            workflow.meta = {**(workflow.meta or {}), "error": "Cannot schedule content in the past"}
+            results.append(False)
+            continue
+
+        workflow.status = "scheduled"
+        due.append((workflow.id, workflow.schedule_time))
+        results.append(True)
+
+    if due:
+        db.add_all([ScheduledJob(workflow_id=workflow_id, run_at=run_at) for workflow_id, run_at in due])
+    return results, due
+
+async def cancel_content(db: AsyncSession, workflow_id: int) -> None:
+    """Drop a workflow's pending publish, if any (the caller commits)"""
+    await db.execute(delete(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+    dispatcher.cancel(workflow_id)
+
+def idempotency_key(workflow: Workflow) -> str:
+    """Shared by every attempt at one scheduled post; rescheduling starts a new key"""
+    return f"{workflow.id}:{workflow.schedule_time.isoformat()}"
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the retry after `attempt` failures"""
+    ceiling = min(settings.PUBLISH_RETRY_MAX_SECONDS, settings.PUBLISH_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+async def publish_scheduled(workflow_id: int) -> Optional[datetime]:
+    """
+    Publish one due workflow, logging the attempt. The job row is the source
+    of truth: a missing row means the job was cancelled and a later run_at
+    means it was moved. Retryable failures move the row to a backoff time.
+    Any later run_at is returned for the dispatcher to re-queue, so retries
+    wait in the heap rather than in a sleeping task.
+
+    A succeeded attempt under the same idempotency key is never sent again,
+    and the key travels with the request so the platform can drop a repeat
+    sent before a crash let us record the outcome. Final outcomes go through
+    the status writer, which batches them with other publishes.
+
+    No database connection is held across the platform request: the pool is
+    small, and a slow platform would otherwise starve every other session.
+    """
+    from ..db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        job = await db.scalar(select(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+        if job is None:
+            return None
+        if job.run_at > datetime.utcnow():
+            return job.run_at
+
+        workflow = await db.get(Workflow, workflow_id)
+        if workflow is None:
+            await db.delete(job)
+            await db.commit()
+            return None
+
+        key = idempotency_key(workflow)
+        already_published = status_writer.published(key) or await db.scalar(
+            select(PublishAttempt.id).where(PublishAttempt.idempotency_key == key, PublishAttempt.succeeded)
+        ) is not None
+        if already_published:
+            status_writer.finish_job(workflow_id, job.run_at)
+            update_workflow_status(workflow_id, "published")
+            return None
+
+        run_at, attempt = job.run_at, job.attempts + 1
+        platform, content = workflow.platform, workflow.content
+
     try:
-        # Publish based on platform
-        if platform == "twitter":
-            await publish_to_twitter(content)
-        elif platform == "facebook":
-            await publish_to_facebook(content)
-        elif platform == "instagram":
-            await publish_to_instagram(content)
-        elif platform == "linkedin":
-            await publish_to_linkedin(content)
-        
-        # Update workflow status to published
-        # Note: In a real implementation, this would use a proper DB update
-        update_workflow_status(workflow_id, "published")
-        
+        if not await publish_content(platform, content, key):
+            raise PublishError(getattr(platform, "value", platform), None, "publisher reported a failure")
     except Exception as e:
-        # Handle publishing failure
-        update_workflow_status(workflow_id, "failed", str(e))
+        error = str(e)[:1000]
+        if getattr(e, "retryable", True) and attempt < settings.PUBLISH_MAX_ATTEMPTS:
+            # The new run_at must be durable before the dispatcher relies on it. The
+            # job is only moved if nobody cancelled or rescheduled it meanwhile.
+            retry_at = datetime.utcnow() + timedelta(seconds=retry_delay(attempt))
+            async with AsyncSessionLocal() as db:
+                db.add(PublishAttempt(
+                    workflow_id=workflow_id, idempotency_key=key, attempt=attempt, succeeded=False, error=error
+                ))
+                moved = await db.execute(
+                    update(ScheduledJob)
+                    .where(ScheduledJob.workflow_id == workflow_id, ScheduledJob.run_at == run_at)
+                    .values(attempts=attempt, run_at=retry_at)
+                )
+                await db.commit()
+            return retry_at if moved.rowcount else None
 
-async def publish_to_twitter(content: dict) -> bool:
-    """Publish content to Twitter"""
-    # Implementation would use Twitter API
-    return True
+        # Out of attempts, or a failure that retrying cannot fix
+        status_writer.record_attempt(
+            workflow_id=workflow_id, idempotency_key=key, attempt=attempt, succeeded=False, error=error
+        )
+        status_writer.finish_job(workflow_id, run_at)
+        update_workflow_status(workflow_id, "dead_letter", str(e))
+        return None
 
-async def publish_to_facebook(content: dict) -> bool:
-    """Publish content to Facebook"""
-    # Implementation would use Facebook API
-    return True
+    status_writer.record_attempt(workflow_id=workflow_id, idempotency_key=key, attempt=attempt, succeeded=True)
+    status_writer.finish_job(workflow_id, run_at)
+    update_workflow_status(workflow_id, "published")
+    return None
 
-async def publish_to_instagram(content: dict) -> bool:
-    """Publish content to Instagram"""
-    # Implementation would use Instagram API
-    return True
+async def replay_content(db: AsyncSession, workflows: List[Workflow]) -> List[Tuple[int, datetime]]:
+    """
+    Reset dead-lettered workflows to publish now with a fresh retry budget.
+    Returns their jobs for `dispatcher.schedule_many` once the caller has
+    committed; firing earlier would find no job row and drop the replay.
+    """
+    now = datetime.utcnow()
+    await db.execute(delete(ScheduledJob).where(ScheduledJob.workflow_id.in_([w.id for w in workflows])))
+    db.add_all([ScheduledJob(workflow_id=workflow.id, run_at=now, attempts=0) for workflow in workflows])
+    for workflow in workflows:
+        workflow.status = "scheduled"
+        status_writer.discard(workflow.id)
+    return [(workflow.id, now) for workflow in workflows]
 
-async def publish_to_linkedin(content: dict) -> bool:
-    """Publish content to LinkedIn"""
-    # Implementation would use LinkedIn API
-    return True
+async def publish_content(platform: str, content: dict, idempotency_key: Optional[str] = None) -> bool:
+    """Publish content to the given platform through the shared publisher pool"""
+    return await publisher_pool.publish(platform, content, idempotency_key)
 
 def update_workflow_status(
     workflow_id: int,
     status: str,
     error: Optional[str] = None
 ) -> None:
-    """Update workflow status in database"""
-    # In a real implementation, this would update the database
-    pass
+    """Queue a workflow status change; the status writer commits it with others shortly"""
+    status_writer.update(workflow_id, status, {"error": error} if error is not None else None)
+
+dispatcher = PublishDispatcher()
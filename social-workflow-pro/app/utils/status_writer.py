@@ -0,0 +1,211 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import logging
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+from ..models.workflow import PublishAttempt, ScheduledJob, Workflow
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+workflows_table = Workflow.__table__
+# Keys per IN (...) list, to stay under the database's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+class PendingStatus:
+    """Coalesced writes for one workflow: the latest status plus merged metadata"""
+
+    __slots__ = ("status", "metadata")
+
+    def __init__(self):
+        self.status: Optional[str] = None
+        self.metadata: Dict[str, Any] = {}
+
+    def merge(self, status: Optional[str], metadata: Optional[Dict[str, Any]]) -> None:
+        if status is not None:
+            self.status = status
+        if metadata:
+            self.metadata.update(metadata)
+
+class StatusWriter:
+    """
+    Write-behind queue for the publish path's bookkeeping.
+
+    Status changes and metadata patches are coalesced per workflow (the last
+    status wins, metadata keys merge), and together with attempt records and
+    finished job rows they are written in one transaction every
+    `flush_interval` seconds, or sooner once `max_pending` writes are waiting.
+    A failed flush puts its writes back under any newer ones for the next try.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None, max_pending: Optional[int] = None):
+        self.flush_interval = flush_interval or settings.STATUS_FLUSH_INTERVAL_SECONDS
+        self.max_pending = max_pending or settings.STATUS_FLUSH_MAX_PENDING
+        self._statuses: Dict[int, PendingStatus] = {}
+        self._attempts: List[Dict[str, Any]] = []
+        self._finished_jobs: List[Tuple[int, datetime]] = []
+        self._published_keys: Set[str] = set()
+        # Workflows discarded while a flush is writing: (statuses only, with attempts)
+        self._discarded_in_flush: Optional[Tuple[Set[int], Set[int]]] = None
+        self._flush_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._statuses) + len(self._attempts) + len(self._finished_jobs)
+
+    def update(
+        self,
+        workflow_id: int,
+        status: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._statuses.setdefault(workflow_id, PendingStatus()).merge(status, metadata)
+        self._check_size()
+
+    def record_attempt(self, **attempt: Any) -> None:
+        self._attempts.append(attempt)
+        if attempt.get("succeeded"):
+            self._published_keys.add(attempt["idempotency_key"])
+        self._check_size()
+
+    def finish_job(self, workflow_id: int, run_at: datetime) -> None:
+        """Delete the job row, unless it has been moved to another run_at in the meantime"""
+        self._finished_jobs.append((workflow_id, run_at))
+        self._check_size()
+
+    def published(self, idempotency_key: str) -> bool:
+        """Whether a success under this key is waiting to be written"""
+        return idempotency_key in self._published_keys
+
+    def discard(self, workflow_id: int, attempts: bool = False) -> None:
+        """Drop a workflow's pending status, and with `attempts` its attempt records too"""
+        self._statuses.pop(workflow_id, None)
+        if attempts:
+            self._attempts = [a for a in self._attempts if a["workflow_id"] != workflow_id]
+        if self._discarded_in_flush is not None:
+            self._discarded_in_flush[1 if attempts else 0].add(workflow_id)
+
+    def _check_size(self) -> None:
+        if len(self) >= self.max_pending:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """Write everything pending in one transaction; returns the number of writes"""
+        from ..db.session import AsyncSessionLocal
+
+        async with self._flush_lock:
+            self._full.clear()
+            if not len(self):
+                return 0
+            statuses, self._statuses = self._statuses, {}
+            attempts, self._attempts = self._attempts, []
+            finished_jobs, self._finished_jobs = self._finished_jobs, []
+            self._discarded_in_flush = (set(), set())
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self._write_statuses(db, statuses)
+                    if attempts:
+                        await db.execute(insert(PublishAttempt), attempts)
+                    for i in range(0, len(finished_jobs), IN_CHUNK_SIZE):
+                        await db.execute(delete(ScheduledJob).where(
+                            tuple_(ScheduledJob.workflow_id, ScheduledJob.run_at).in_(finished_jobs[i:i + IN_CHUNK_SIZE])
+                        ))
+                    await db.commit()
+            except Exception:
+                self._requeue(statuses, attempts, finished_jobs)
+                raise
+            finally:
+                self._discarded_in_flush = None
+            self._published_keys.difference_update(
+                attempt["idempotency_key"] for attempt in attempts if attempt.get("succeeded")
+            )
+            return len(statuses) + len(attempts) + len(finished_jobs)
+
+    @staticmethod
+    async def _write_statuses(db, statuses: Dict[int, PendingStatus]) -> None:
+        if not statuses:
+            return
+        # Metadata patches merge into the stored document, so read those rows first
+        patched = [workflow_id for workflow_id, pending in statuses.items() if pending.metadata]
+        stored = {}
+        for i in range(0, len(patched), IN_CHUNK_SIZE):
+            rows = await db.execute(
+                select(workflows_table.c.id, workflows_table.c["metadata"])
+                .where(workflows_table.c.id.in_(patched[i:i + IN_CHUNK_SIZE]))
+            )
+            stored.update(rows.all())
+
+        status_rows, metadata_rows = [], []
+        for workflow_id, pending in statuses.items():
+            if pending.metadata:
+                metadata_rows.append({
+                    "b_id": workflow_id,
+                    "b_metadata": {**(stored.get(workflow_id) or {}), **pending.metadata},
+                })
+            if pending.status is not None:
+                status_rows.append({"b_id": workflow_id, "b_status": pending.status})
+
+        # One executemany UPDATE per kind of change
+        by_id = workflows_table.c.id == bindparam("b_id")
+        if status_rows:
+            await db.execute(update(workflows_table).where(by_id).values(status=bindparam("b_status")), status_rows)
+        if metadata_rows:
+            await db.execute(
+                update(workflows_table).where(by_id).values({workflows_table.c["metadata"]: bindparam("b_metadata")}),
+                metadata_rows
+            )
+
+    def _requeue(
+        self,
+        statuses: Dict[int, PendingStatus],
+        attempts: List[Dict[str, Any]],
+        finished_jobs: List[Tuple[int, datetime]]
+    ) -> None:
+        """
+        Put a failed flush's writes back under any newer ones, except for
+        workflows discarded since they were taken: those edits must win
+        """
+        discarded, discarded_attempts = self._discarded_in_flush
+        discarded = discarded | discarded_attempts
+        for workflow_id, pending in statuses.items():
+            if workflow_id in discarded:
+                continue
+            newer = self._statuses.get(workflow_id)
+            if newer is not None:
+                pending.merge(newer.status, newer.metadata)
+            self._statuses[workflow_id] = pending
+        self._attempts[:0] = [a for a in attempts if a["workflow_id"] not in discarded_attempts]
+        self._finished_jobs[:0] = finished_jobs
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            # Bound to the loop that runs the writer, which after a restart may be a new one
+            self._full = asyncio.Event()
+            self._check_size()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out whatever is still pending"""
+        if self._task is not None:
+            # Let the loop finish its current flush; cancelling it mid-write would lose the batch
+            self._stopping = True
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing %d pending status writes failed", len(self))
+
+status_writer = StatusWriter()
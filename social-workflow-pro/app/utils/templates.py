@@ -0,0 +1,53 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+# Placeholders look like [topic], [dish], [THEME] or [space/look]
+SLOT_RE = re.compile(r'\[([^\[\]]+)\]')
+
+class CompiledTemplate:
+    """
+    A content template parsed once into literal and slot segments.
+
+    `literals` always has one more entry than `slot_names`; rendering
+    interleaves them and joins once. Slots without a value are left in
+    place as `[name]` so callers can still see what needs filling.
+    """
+    __slots__ = ('source', 'literals', 'slot_names', 'slots')
+
+    def __init__(self, source: str):
+        # split() with one capture group alternates literal, slot, literal, ...
+        parts = SLOT_RE.split(source)
+        self.source = source
+        self.literals = parts[0::2]
+        self.slot_names = parts[1::2]
+        self.slots = frozenset(self.slot_names)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill slots from `values`, keeping unknown placeholders verbatim"""
+        if not self.slot_names:
+            return self.source
+
+        pieces = [self.literals[0]]
+        for name, literal in zip(self.slot_names, self.literals[1:]):
+            value = values.get(name)
+            pieces.append(f'[{name}]' if value is None else value)
+            pieces.append(literal)
+        return ''.join(pieces)
+
+    def render_batch(self, values_list: Iterable[Dict[str, str]]) -> List[str]:
+        """Render the template once per dict of slot values"""
+        return [self.render(values) for values in values_list]
+
+    def missing(self, values: Dict[str, str]) -> List[str]:
+        """Slots (in template order, without duplicates) that `values` leaves unfilled"""
+        return [name for name in dict.fromkeys(self.slot_names) if values.get(name) is None]
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> CompiledTemplate:
+    """Parse a template once; repeated calls return the cached compilation"""
+    return CompiledTemplate(source)
+
+def unfilled_slots(*filled: Iterable[str]) -> List[str]:
+    """Merge the unfilled slot lists of several rendered pieces, preserving order"""
+    return list(dict.fromkeys(name for names in filled for name in names))
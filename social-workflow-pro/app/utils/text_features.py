@@ -0,0 +1,78 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple
+
+EMOJI_RE = re.compile(r'[\U0001F300-\U0001F999]')
+
+# Hashtags, mentions, emojis and questions never overlap, so one scan counts them all
+TOKEN_RE = re.compile(
+    r'(?P<hashtags>#\w+)'
+    r'|(?P<mentions>@\w+)'
+    r'|(?P<emojis>[\U0001F300-\U0001F999])'
+    r'|(?P<questions>\?)'
+)
+
+# Every call-to-action keyword any analyzer looks for, matched as substrings
+# of the lowercased text like the per-analyzer patterns they replace
+CTA_KEYWORDS = ('like', 'comment', 'share', 'save', 'tag', 'try', 'click', 'follow', 'check out')
+CTA_RE = re.compile('|'.join(re.escape(keyword) for keyword in CTA_KEYWORDS))
+
+# Keyword sets used by the viral generator and by the optimizer/trend analyzer
+VIRAL_CTA = ('like', 'comment', 'share', 'save', 'tag', 'try')
+ANALYZER_CTA = ('click', 'share', 'like', 'comment', 'follow', 'check out')
+
+SYLLABLE_RE = re.compile(r'[aeiou]+')
+SENTENCE_RE = re.compile(r'[.!?]+')
+
+_CTA_INDEX = {keyword: i for i, keyword in enumerate(CTA_KEYWORDS)}
+
+class TextFeatures(NamedTuple):
+    """Surface features of one piece of text, shared by every analyzer"""
+    length: int
+    words: int
+    unique_words: int
+    sentences: int
+    syllables: int
+    hashtags: int
+    mentions: int
+    emojis: int
+    questions: int
+    cta_counts: tuple  # Occurrences of each CTA_KEYWORDS entry, in order
+
+    def calls_to_action(self, keywords: Iterable[str] = CTA_KEYWORDS) -> int:
+        """Total occurrences of the given call-to-action keywords"""
+        return sum(self.cta_counts[_CTA_INDEX[keyword]] for keyword in keywords)
+
+@lru_cache(maxsize=4096)
+def extract_features(text: str) -> TextFeatures:
+    """Compute every surface feature of `text` at once"""
+    counts = {'hashtags': 0, 'mentions': 0, 'emojis': 0, 'questions': 0}
+    for match in TOKEN_RE.finditer(text):
+        counts[match.lastgroup] += 1
+
+    lowered = text.lower()
+    cta_counts = [0] * len(CTA_KEYWORDS)
+    for match in CTA_RE.finditer(lowered):
+        cta_counts[_CTA_INDEX[match.group()]] += 1
+
+    words = lowered.split()
+    return TextFeatures(
+        length=len(text),
+        words=len(words),
+        unique_words=len(set(words)),
+        sentences=len(SENTENCE_RE.split(text)),
+        syllables=len(SYLLABLE_RE.findall(lowered)),
+        cta_counts=tuple(cta_counts),
+        **counts
+    )
+
+def extract_features_batch(texts: Iterable[str]) -> List[TextFeatures]:
+    """Features for many texts; duplicates within the batch are extracted once"""
+    extracted = {}
+    results = []
+    for text in texts:
+        features = extracted.get(text)
+        if features is None:
+            features = extracted[text] = extract_features(text)
+        results.append(features)
+    return results
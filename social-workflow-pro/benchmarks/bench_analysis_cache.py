@@ -0,0 +1,78 @@
+"""
+Content analysis cache.
+
+Analyzes a stream of payloads in which a share are repeats (reposted or
+resubmitted content, with keys in any order), first with the cache
+disabled and then enabled, and reports payloads per second and hit rate:
+
+    python benchmarks/bench_analysis_cache.py --items 50000 --distinct 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import content_analyzer  # noqa: E402
+from app.utils.cache import LRUCache  # noqa: E402
+
+WORDS = "great launch today amazing product summer sale community event awesome team coffee".split()
+
+
+def payloads(items: int, distinct: int) -> list:
+    rng = random.Random(0)
+    pool = [
+        {
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60))),
+            "hashtags": [f"#{rng.choice(WORDS)}" for _ in range(rng.randint(0, 8))],
+            "media": ["image.jpg"],
+        }
+        for _ in range(distinct)
+    ]
+    stream = []
+    for _ in range(items):
+        content = rng.choice(pool)
+        keys = list(content)
+        rng.shuffle(keys)
+        stream.append({key: content[key] for key in keys})
+    return stream
+
+
+class NoCache:
+    def get(self, key, default=None):
+        return default
+
+    def put(self, key, value):
+        pass
+
+
+async def analyze_each(stream: list) -> None:
+    for content in stream:
+        await content_analyzer.analyze_content(content)
+
+
+def measure(stream: list, cache) -> float:
+    content_analyzer._analysis_cache = cache
+    start = time.perf_counter()
+    asyncio.run(analyze_each(stream))
+    return len(stream) / (time.perf_counter() - start)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Content analysis cache benchmark")
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--distinct", type=int, default=5_000)
+    args = parser.parse_args()
+
+    stream = payloads(args.items, args.distinct)
+    print(f"{'uncached':>10}: {measure(stream, NoCache()):9.0f} payloads/s")
+    cache = LRUCache(maxsize=args.distinct)
+    rate = measure(stream, cache)
+    print(f"{'cached':>10}: {rate:9.0f} payloads/s  hit rate {cache.stats()['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,140 @@
+"""
+Workflow endpoint latency under concurrent clients, sync vs async sessions.
+
+"blocking" mounts the previous handler shape: async endpoints calling a
+synchronous Session, so every query and commit stalls the event loop.
+"async" is the real API on AsyncSession. Both run against the same SQLite
+file through an in-process ASGI client, each client creating a workflow,
+reading it back and pausing for a think time, so the offered load stays below
+saturation and the tail reflects event-loop stalls rather than queueing.
+
+The blocking baseline opens unpooled connections. With the app's pooled
+sessions it deadlocks under load: a handler blocks the loop waiting for a
+connection that only a (loop-driven) dependency teardown can return.
+
+
+    python benchmarks/bench_async_db.py --clients 200 --requests 10
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.migrations import migrate  # noqa: E402
+from app.main import app as async_app  # noqa: E402
+from app.models.workflow import Campaign, Workflow  # noqa: E402
+from app.schemas.workflow import WorkflowCreate, WorkflowInDB  # noqa: E402
+from app.utils.content_analyzer import analyze_content  # noqa: E402
+
+BlockingSession = sessionmaker(bind=create_engine(settings.DATABASE_URL, poolclass=NullPool))
+blocking_app = FastAPI()
+
+
+def get_blocking_db():
+    db = BlockingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@blocking_app.post("/api/v1/workflows/", response_model=WorkflowInDB)
+async def create_workflow_blocking(workflow: WorkflowCreate, db: Session = Depends(get_blocking_db)):
+    db_workflow = Workflow(
+        campaign_id=workflow.campaign_id,
+        content_type=workflow.content_type,
+        status="draft",
+        platform=workflow.platform,
+        content=await analyze_content(workflow.content),
+        schedule_time=workflow.schedule_time,
+        meta=workflow.metadata or {}
+    )
+    db.add(db_workflow)
+    db.commit()
+    db.refresh(db_workflow)
+    return db_workflow
+
+
+@blocking_app.get("/api/v1/workflows/{workflow_id}", response_model=WorkflowInDB)
+async def get_workflow_blocking(workflow_id: int, db: Session = Depends(get_blocking_db)):
+    return db.get(Workflow, workflow_id)
+
+
+PAYLOAD = {
+    "campaign_id": 1,
+    "content_type": "post",
+    "platform": "facebook",
+    "content": {"text": "Fresh pasta night is back! Tag a friend #pasta #dinner"},
+    "schedule_time": "2099-01-01T12:00:00",
+}
+
+
+async def client_loop(client: httpx.AsyncClient, requests: int, think: float, latencies: list) -> None:
+    for _ in range(requests):
+        await asyncio.sleep(random.uniform(0, 2 * think))
+        start = time.perf_counter()
+        response = await client.post("/api/v1/workflows/", json=PAYLOAD)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = await client.get(f"/api/v1/workflows/{response.json()['id']}")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def measure(app: FastAPI, clients: int, requests: int, think: float) -> dict:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, requests, think, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[math.ceil(len(latencies) * 0.99) - 1] * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def seed_campaign() -> None:
+    # ASGITransport does not run the app's lifespan, so the schema is set up here
+    with BlockingSession() as db:
+        migrate(db.connection())
+        if db.get(Campaign, 1) is None:
+            db.add(Campaign(id=1, name="bench", status="active"))
+        db.commit()
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs async session latency benchmark")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="create+get rounds per client")
+    parser.add_argument("--think-ms", type=float, default=1000, help="mean pause between rounds")
+    args = parser.parse_args()
+
+    seed_campaign()
+    for name, app in (("blocking (sync Session)", blocking_app), ("async (AsyncSession)", async_app)):
+        stats = asyncio.run(measure(app, args.clients, args.requests, args.think_ms / 1000))
+        print(f"{name:>24}: p50 {stats['p50']:8.1f} ms  p99 {stats['p99']:8.1f} ms  {stats['rps']:7.0f} req/s")
+
+
+if __name__ == "__main__":
+    run()
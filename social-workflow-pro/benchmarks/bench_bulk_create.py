@@ -0,0 +1,86 @@
+"""
+Bulk vs one-at-a-time workflow creation.
+
+Creates a campaign's worth of workflows through POST /workflows/ (one
+analysis, commit, refresh and scheduler task per call) and through a single
+POST /workflows/bulk, using an in-process ASGI client against a SQLite file:
+
+    python benchmarks/bench_bulk_create.py --items 300 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+
+from app.db.migrations import migrate  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+CAMPAIGN = {
+    "name": "bench",
+    "start_date": "2099-01-01T00:00:00",
+    "end_date": "2099-12-31T00:00:00",
+    "status": "active",
+}
+
+
+def make_items(count: int) -> list:
+    return [
+        {
+            "campaign_id": 1,
+            "content_type": "post",
+            "platform": "instagram",
+            "content": {"text": f"Day {i}: behind the scenes at the studio, share your favourite shot! #day{i}"},
+            "schedule_time": f"2099-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00",
+        }
+        for i in range(count)
+    ]
+
+
+async def measure(items: int, rounds: int) -> dict:
+    payload = make_items(items)
+    single, bulk = [], []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        (await client.post("/api/v1/campaigns/", json=CAMPAIGN)).raise_for_status()
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for item in payload:
+                (await client.post("/api/v1/workflows/", json=item)).raise_for_status()
+            single.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            response = await client.post("/api/v1/workflows/bulk", json={"workflows": payload})
+            response.raise_for_status()
+            assert response.json()["created"] == items
+            bulk.append(time.perf_counter() - start)
+
+    return {
+        "single POST /workflows/": items / statistics.median(single),
+        "POST /workflows/bulk": items / statistics.median(bulk),
+    }
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Bulk workflow creation benchmark")
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # ASGITransport does not run the app's lifespan, so the schema is set up here
+    with engine.begin() as conn:
+        migrate(conn)
+    results = asyncio.run(measure(args.items, args.rounds))
+    for name, rate in results.items():
+        print(f"{name:>24}: {rate:9.0f} workflows/s")
+
+
+if __name__ == "__main__":
+    run()
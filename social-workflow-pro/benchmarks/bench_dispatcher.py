@@ -0,0 +1,131 @@
+"""
+Publish dispatcher at 100k scheduled items.
+
+Compares registering N future publishes with the dispatcher heap against the
+one-sleeping-task-per-workflow approach it replaced (time and traced memory),
+then times reschedule/cancel, draining N due jobs through a no-op publisher,
+and recovering N persisted jobs from a SQLite file on startup:
+
+    python benchmarks/bench_dispatcher.py --items 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from app.db.session import engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.workflow import ScheduledJob  # noqa: E402
+from app.utils.scheduler import PublishDispatcher  # noqa: E402
+
+
+def future_times(count: int) -> list:
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    return [now + timedelta(days=1, seconds=rng.randint(0, 30 * 86400)) for _ in range(count)]
+
+
+async def measure_registration(times: list) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(asyncio.sleep((run_at - datetime.utcnow()).total_seconds())) for run_at in times]
+    await asyncio.sleep(0)  # Let every task start sleeping
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"{'one task per workflow':>28}: {elapsed * 1000:9.1f} ms  {peak / 2**20:7.1f} MiB")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    dispatcher = PublishDispatcher()
+    dispatcher.schedule_many(enumerate(times))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'dispatcher heap':>28}: {elapsed * 1000:9.1f} ms  {peak / 2**20:7.1f} MiB")
+
+    rng = random.Random(1)
+    ids = rng.sample(range(len(times)), len(times) // 2)
+    start = time.perf_counter()
+    for workflow_id in ids:
+        dispatcher.schedule(workflow_id, times[workflow_id] + timedelta(hours=1))
+    elapsed = time.perf_counter() - start
+    print(f"{'reschedule':>28}: {elapsed / len(ids) * 1e6:9.2f} us/op")
+
+    start = time.perf_counter()
+    for workflow_id in ids:
+        dispatcher.cancel(workflow_id)
+    elapsed = time.perf_counter() - start
+    print(f"{'cancel':>28}: {elapsed / len(ids) * 1e6:9.2f} us/op")
+
+
+class PreloadedDispatcher(PublishDispatcher):
+    """Starts from whatever was loaded into it instead of the database"""
+
+    async def recover(self) -> int:
+        return len(self)
+
+
+async def measure_drain(count: int) -> None:
+    published = 0
+    done = asyncio.Event()
+
+    async def publish(workflow_id):
+        nonlocal published
+        published += 1
+        if published == count:
+            done.set()
+
+    dispatcher = PreloadedDispatcher(publish=publish)
+    past = datetime.utcnow() - timedelta(seconds=1)
+    dispatcher.load((workflow_id, past) for workflow_id in range(count))
+    start = time.perf_counter()
+    await dispatcher.start()
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+    print(f"{'drain due jobs':>28}: {count / elapsed:9.0f} jobs/s")
+
+
+async def measure_recovery(times: list) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(ScheduledJob.__table__.delete())
+        conn.execute(ScheduledJob.__table__.insert(), [
+            {"workflow_id": workflow_id, "run_at": run_at} for workflow_id, run_at in enumerate(times, 1)
+        ])
+
+    dispatcher = PublishDispatcher()
+    start = time.perf_counter()
+    recovered = await dispatcher.recover()
+    elapsed = time.perf_counter() - start
+    print(f"{'recover from database':>28}: {elapsed * 1000:9.1f} ms  ({recovered} jobs)")
+
+
+async def main(items: int) -> None:
+    times = future_times(items)
+    await measure_registration(times)
+    await measure_drain(items)
+    await measure_recovery(times)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Publish dispatcher benchmark")
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.items))
+
+
+if __name__ == "__main__":
+    run()
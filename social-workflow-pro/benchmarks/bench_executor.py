@@ -0,0 +1,84 @@
+"""
+Event-loop stalls from NLP analysis, inline vs the analysis worker pool.
+
+Runs ContentOptimizer.analyze_contents (TextBlob sentiment plus readability)
+over batches of texts while a ticker task measures how late the event loop
+wakes it, first with the analysis inline on the loop and then in the process
+pool:
+
+    python benchmarks/bench_executor.py --batches 20 --batch-size 1000 --workers 4
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import content_optimizer  # noqa: E402
+from app.utils.executor import AnalysisExecutor  # noqa: E402
+
+TICK = 0.005
+WORDS = "great launch today amazing product summer sale community event awesome team coffee".split()
+
+
+def payloads(batches: int, batch_size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        [" ".join(rng.choice(WORDS) for _ in range(rng.randint(100, 400))) for _ in range(batch_size)]
+        for _ in range(batches)
+    ]
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def measure(label: str, executor: AnalysisExecutor, batches: list, concurrency: int) -> None:
+    content_optimizer.analysis_executor = executor
+    optimizer = content_optimizer.ContentOptimizer()
+    await executor.start()
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    queue = iter(batches)
+
+    async def client():
+        for batch in queue:
+            await optimizer.analyze_contents(batch)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    executor.shutdown()
+
+    lags.sort()
+    p99 = lags[math.ceil(len(lags) * 0.99) - 1]
+    items = sum(len(batch) for batch in batches)
+    print(f"{label:>8}: {items / elapsed:9.0f} payloads/s  loop lag p99 {p99 * 1000:7.1f} ms  max {lags[-1] * 1000:7.1f} ms")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Analysis executor benchmark")
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4, help="batches analyzed at once")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(measure("inline", AnalysisExecutor(workers=0), payloads(args.batches, args.batch_size, 0), args.concurrency))
+    asyncio.run(measure(
+        "pool", AnalysisExecutor(workers=args.workers, warmup=()), payloads(args.batches, args.batch_size, 1), args.concurrency
+    ))
+
+
+if __name__ == "__main__":
+    run()
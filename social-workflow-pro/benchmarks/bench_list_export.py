@@ -0,0 +1,119 @@
+"""
+Workflow listing serialization and NDJSON export.
+
+Seeds a SQLite file with workflows carrying analyzed content, then times
+500-row pages of GET /workflows/ built the old way (ORM objects validated
+through WorkflowInDB) against the orjson row path, and drains the
+GET /workflows/export stream while tracking peak traced memory:
+
+    python benchmarks/bench_list_export.py --workflows 1000000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.api.endpoints.workflow import export_workflows  # noqa: E402
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.workflow import Campaign, ContentType, Platform, Workflow  # noqa: E402
+from app.schemas.workflow import WorkflowInDB  # noqa: E402
+from app.services.workflow_service import WorkflowService  # noqa: E402
+from app.utils.content_analyzer import _compute_metrics  # noqa: E402
+
+BATCH_SIZE = 50_000
+PAGE = 500
+
+
+def seed(workflows: int) -> None:
+    start = datetime(2030, 1, 1)
+    content = {"text": "Big summer launch for the whole community, come say hello " * 5, "hashtags": ["#launch"]}
+    content["metrics"] = _compute_metrics(content)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Campaign.__table__.insert(), [{"id": 1, "name": "campaign", "status": "active"}])
+        for offset in range(0, workflows, BATCH_SIZE):
+            conn.execute(Workflow.__table__.insert(), [
+                {
+                    "campaign_id": 1,
+                    "content_type": ContentType.POST,
+                    "status": "scheduled",
+                    "platform": Platform.FACEBOOK,
+                    "content": content,
+                    "metadata": {"source": "bench"},
+                    "schedule_time": start + timedelta(minutes=offset + i),
+                }
+                for i in range(min(BATCH_SIZE, workflows - offset))
+            ])
+
+
+async def time_pages(render, runs: int) -> float:
+    """Median milliseconds to query and encode one page"""
+    timings = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(runs):
+            start = time.perf_counter()
+            await render(db)
+            timings.append(time.perf_counter() - start)
+            db.expunge_all()
+    return statistics.median(timings) * 1000
+
+
+async def measure_listing(runs: int) -> None:
+    adapter = TypeAdapter(List[WorkflowInDB])
+
+    async def validated(db):
+        # What FastAPI does with response_model=List[WorkflowInDB]
+        workflows, _ = await WorkflowService.get_workflows(db, limit=PAGE)
+        return JSONResponse(jsonable_encoder(adapter.validate_python(workflows, from_attributes=True))).body
+
+    async def rows(db):
+        page, _ = await WorkflowService.get_workflow_rows(db, limit=PAGE)
+        return ORJSONResponse(page).body
+
+    print(f"{'ORM + WorkflowInDB':>20}: {await time_pages(validated, runs):8.1f} ms per {PAGE}-row page")
+    print(f"{'rows + orjson':>20}: {await time_pages(rows, runs):8.1f} ms per {PAGE}-row page")
+
+
+async def measure_export(workflows: int) -> None:
+    # Drained straight from the endpoint: httpx's ASGI transport would buffer the whole body
+    tracemalloc.start()
+    lines = 0
+    start = time.perf_counter()
+    response = await export_workflows(fields=None)
+    async for chunk in response.body_iterator:
+        lines += chunk.count(b"\n")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert lines == workflows, lines
+    print(f"{'export':>20}: {lines} rows in {elapsed:.1f}s ({lines / elapsed:.0f} rows/s), "
+          f"peak traced memory {peak / 2**20:.1f} MiB")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Workflow listing and export benchmark")
+    parser.add_argument("--workflows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.workflows)
+    asyncio.run(measure_listing(args.runs))
+    asyncio.run(measure_export(args.workflows))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,117 @@
+"""
+Keyset vs offset pagination for workflow listings.
+
+Seeds a SQLite file with campaigns and workflows, then times the first page
+and a deep page for the keyset listing (WorkflowService.get_workflows) and
+for the OFFSET query it replaced, unfiltered and filtered by campaign/status:
+
+    python benchmarks/bench_pagination.py --workflows 1000000 --depth 9000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.workflow import Campaign, ContentType, Platform, Workflow, WorkflowStatus  # noqa: E402
+from app.services.workflow_service import WorkflowService  # noqa: E402
+
+BATCH_SIZE = 50_000
+
+
+def seed(workflows: int, campaigns: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    start = datetime(2030, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Campaign.__table__.insert(), [
+            {"id": i, "name": f"campaign {i}", "status": "active", "start_date": start}
+            for i in range(1, campaigns + 1)
+        ])
+        for offset in range(0, workflows, BATCH_SIZE):
+            conn.execute(Workflow.__table__.insert(), [
+                {
+                    "campaign_id": rng.randint(1, campaigns),
+                    "content_type": ContentType.POST,
+                    "status": rng.choice(list(WorkflowStatus)),
+                    "platform": Platform.FACEBOOK,
+                    "content": {"text": "bench"},
+                    "schedule_time": start + timedelta(minutes=rng.randint(0, 525_600)),
+                }
+                for _ in range(min(BATCH_SIZE, workflows - offset))
+            ])
+
+
+async def time_call(fn, runs: int) -> float:
+    """Median milliseconds per call"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def measure(depth: int, limit: int, runs: int) -> None:
+    filters = {
+        "unfiltered": {},
+        "campaign_id=1": {"campaign_id": 1},
+        "status=scheduled": {"status": "scheduled"},
+    }
+    async with AsyncSessionLocal() as db:
+        for name, where in filters.items():
+            # Walk to the deep page once to get its cursor, as a client would
+            cursor = None
+            pages = 0
+            for pages in range(depth):
+                _, next_cursor = await WorkflowService.get_workflows(db, limit=limit, cursor=cursor, **where)
+                if next_cursor is None:
+                    break
+                cursor = next_cursor
+            db.expunge_all()
+
+            def offset_page(skip):
+                query = select(Workflow).filter_by(**where).order_by(Workflow.schedule_time, Workflow.id)
+                return lambda: db.scalars(query.offset(skip).limit(limit))
+
+            results = {
+                "keyset page 1": time_call(lambda: WorkflowService.get_workflows(db, limit=limit, **where), runs),
+                f"keyset page {pages + 1}": time_call(
+                    lambda: WorkflowService.get_workflows(db, limit=limit, cursor=cursor, **where), runs
+                ),
+                "offset page 1": time_call(offset_page(0), runs),
+                f"offset page {pages + 1}": time_call(offset_page(pages * limit), runs),
+            }
+            for label, timing in results.items():
+                print(f"{name:>18} {label:>20}: {await timing:9.2f} ms")
+                db.expunge_all()
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Workflow pagination benchmark")
+    parser.add_argument("--workflows", type=int, default=1_000_000)
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=9000, help="page to compare against page 1")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed(args.workflows, args.campaigns)
+    print(f"seeded {args.workflows} workflows in {time.perf_counter() - start:.1f}s")
+    asyncio.run(measure(args.depth, args.limit, args.runs))
+
+
+if __name__ == "__main__":
+    run()
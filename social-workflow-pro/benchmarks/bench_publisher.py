@@ -0,0 +1,74 @@
+"""
+Publisher pool throughput against the fake platform server.
+
+Fires a campaign's worth of publishes that all fall due at once, spread over
+the platforms, and compares one-at-a-time publishing, an unlimited stampede
+and the PublisherPool with its per-platform concurrency and rate limits
+(reporting the peak concurrency and requests/second each platform saw):
+
+    python benchmarks/bench_publisher.py --posts 400 --latency-ms 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_platform  # noqa: E402
+from app.utils.publisher import PublisherPool  # noqa: E402
+
+PLATFORMS = ["facebook", "instagram", "linkedin", "twitter"]
+UNLIMITED = 1_000_000
+
+
+async def fire(pool: PublisherPool, posts: int, sequential: bool) -> float:
+    jobs = [(PLATFORMS[i % len(PLATFORMS)], {"text": f"post {i}"}) for i in range(posts)]
+    start = time.perf_counter()
+    if sequential:
+        for platform, content in jobs:
+            await pool.publish(platform, content)
+    else:
+        await asyncio.gather(*(pool.publish(platform, content) for platform, content in jobs))
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    concurrency = dict.fromkeys(PLATFORMS, args.concurrency)
+    rate_limits = dict.fromkeys(PLATFORMS, args.rate)
+    scenarios = {
+        "sequential": (dict.fromkeys(PLATFORMS, UNLIMITED), dict.fromkeys(PLATFORMS, UNLIMITED), True),
+        "stampede (no limits)": (dict.fromkeys(PLATFORMS, UNLIMITED), dict.fromkeys(PLATFORMS, UNLIMITED), False),
+        "publisher pool": (concurrency, rate_limits, False),
+    }
+    for name, (limits, rates, sequential) in scenarios.items():
+        runner, stats = await fake_platform.start(args.port, args.latency_ms / 1000)
+        urls = {platform: f"http://127.0.0.1:{args.port}/{platform}" for platform in PLATFORMS}
+        pool = PublisherPool(api_urls=urls, concurrency=limits, rate_limits=rates)
+        try:
+            elapsed = await fire(pool, args.posts, sequential)
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+        snapshot = stats.snapshot()
+        peak_in_flight = max(platform["peak_in_flight"] for platform in snapshot.values())
+        peak_rate = max(platform["peak_per_second"] for platform in snapshot.values())
+        print(f"{name:>22}: {args.posts / elapsed:8.0f} posts/s  "
+              f"peak per platform: {peak_in_flight:4d} in flight, {peak_rate:4d} req/s")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Publisher pool benchmark")
+    parser.add_argument("--posts", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=10, help="pool limit per platform")
+    parser.add_argument("--rate", type=float, default=50, help="pool requests/second per platform")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+    asyncio.run(main(args))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,100 @@
+"""
+Dashboard polling of single workflows and campaigns.
+
+Seeds a SQLite file, then polls GET /workflows/{id} and GET /campaigns/{id}
+in-process through the ASGI app: with the response cache bypassed, with
+it warm, and with it warm plus If-None-Match revalidation (304s):
+
+    python benchmarks/bench_response_cache.py --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+
+from app.db.migrations import migrate  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.workflow import Campaign, ContentType, Platform, Workflow  # noqa: E402
+from app.utils.content_analyzer import _compute_metrics  # noqa: E402
+from app.utils.response_cache import response_cache  # noqa: E402
+
+WORKFLOWS_PER_CAMPAIGN = 20
+
+
+def seed(campaigns: int) -> None:
+    start = datetime(2030, 1, 1)
+    content = {"text": "Big summer launch for the whole community, come say hello " * 5}
+    content["metrics"] = _compute_metrics(content)
+    with engine.begin() as conn:
+        # ASGITransport does not run the app's lifespan, so the schema is set up here
+        migrate(conn)
+        conn.execute(Campaign.__table__.insert(), [
+            {"id": i, "name": f"campaign {i}", "status": "active", "start_date": start, "end_date": start}
+            for i in range(1, campaigns + 1)
+        ])
+        conn.execute(Workflow.__table__.insert(), [
+            {
+                "campaign_id": i % campaigns + 1,
+                "content_type": ContentType.POST,
+                "status": "scheduled",
+                "platform": Platform.FACEBOOK,
+                "content": content,
+                "metadata": {},
+                "schedule_time": start + timedelta(minutes=i),
+            }
+            for i in range(campaigns * WORKFLOWS_PER_CAMPAIGN)
+        ])
+
+
+async def poll(client: httpx.AsyncClient, paths: list, requests: int, revalidate: bool) -> float:
+    etags = {}
+    start = time.perf_counter()
+    for i in range(requests):
+        path = paths[i % len(paths)]
+        headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+        response = await client.get(path, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+        etags[path] = response.headers["etag"]
+    return requests / (time.perf_counter() - start)
+
+
+async def measure(campaigns: int, requests: int) -> None:
+    targets = {
+        "workflow": [f"/api/v1/workflows/{i}" for i in range(1, 51)],
+        "campaign": [f"/api/v1/campaigns/{i}" for i in range(1, min(campaigns, 50) + 1)],
+    }
+    get = response_cache.get
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for kind, paths in targets.items():
+            response_cache.get = lambda *args, **kwargs: None
+            uncached = await poll(client, paths, requests, revalidate=False)
+            response_cache.get = get
+            response_cache.clear()
+            cached = await poll(client, paths, requests, revalidate=False)
+            revalidated = await poll(client, paths, requests, revalidate=True)
+            print(f"{kind:>9}: {uncached:7.0f} req/s uncached  {cached:7.0f} req/s cached  "
+                  f"{revalidated:7.0f} req/s with If-None-Match")
+    print(response_cache.stats())
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Response cache benchmark")
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    seed(args.campaigns)
+    asyncio.run(measure(args.campaigns, args.requests))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,126 @@
+"""
+Write-behind status updates at publish-time peaks.
+
+Seeds N scheduled workflows in a SQLite file, then records a "published"
+outcome for each of them (status change, attempt row, finished job row) from
+`--concurrency` publishers at once: first with a session and commit per
+outcome, as a naive update_workflow_status would, then through the
+StatusWriter, and reports throughput and the number of commits:
+
+    python benchmarks/bench_status_writer.py --workflows 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import delete, func, select, update  # noqa: E402
+
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.workflow import ContentType, Platform, PublishAttempt, ScheduledJob, Workflow  # noqa: E402
+from app.utils.status_writer import StatusWriter  # noqa: E402
+
+RUN_AT = datetime(2030, 1, 1)
+
+
+def seed(workflows: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Workflow.__table__.insert(), [
+            {
+                "id": i,
+                "content_type": ContentType.POST,
+                "status": "scheduled",
+                "platform": Platform.FACEBOOK,
+                "content": {"text": "bench"},
+                "schedule_time": RUN_AT + timedelta(seconds=i),
+            }
+            for i in range(1, workflows + 1)
+        ])
+        conn.execute(ScheduledJob.__table__.insert(), [
+            {"workflow_id": i, "run_at": RUN_AT + timedelta(seconds=i), "attempts": 0}
+            for i in range(1, workflows + 1)
+        ])
+
+
+async def commit_each(workflow_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        db.add(PublishAttempt(workflow_id=workflow_id, idempotency_key=str(workflow_id), attempt=1, succeeded=True))
+        await db.execute(delete(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+        await db.execute(update(Workflow).where(Workflow.id == workflow_id).values(status="published"))
+        await db.commit()
+
+
+async def drain(ids: list, concurrency: int, record) -> float:
+    queue = iter(ids)
+
+    async def publisher():
+        for workflow_id in queue:
+            await record(workflow_id)
+            await asyncio.sleep(0)  # Other publishers get a turn, as they would awaiting the platform
+
+    start = time.perf_counter()
+    await asyncio.gather(*(publisher() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def check(workflows: int) -> None:
+    async with AsyncSessionLocal() as db:
+        published = await db.scalar(select(func.count()).where(Workflow.status == "published"))
+        jobs = await db.scalar(select(func.count()).select_from(ScheduledJob))
+    assert published == workflows and jobs == 0, (published, jobs)
+
+
+async def measure(workflows: int, concurrency: int) -> None:
+    ids = list(range(1, workflows + 1))
+
+    elapsed = await drain(ids, concurrency, commit_each)
+    await check(workflows)
+    print(f"{'commit per update':>20}: {workflows / elapsed:9.0f} updates/s  {workflows} commits")
+
+    seed(workflows)
+    writer = StatusWriter()
+    flushes = 0
+    flush = writer.flush
+
+    async def counted_flush():
+        nonlocal flushes
+        written = await flush()
+        flushes += bool(written)
+        return written
+    writer.flush = counted_flush
+
+    async def record(workflow_id):
+        writer.record_attempt(workflow_id=workflow_id, idempotency_key=str(workflow_id), attempt=1, succeeded=True)
+        writer.finish_job(workflow_id, RUN_AT + timedelta(seconds=workflow_id))
+        writer.update(workflow_id, "published")
+
+    start = time.perf_counter()
+    await writer.start()
+    await drain(ids, concurrency, record)
+    await writer.stop()  # Timed too: the final flush is part of the cost
+    elapsed = time.perf_counter() - start
+    await check(workflows)
+    print(f"{'status writer':>20}: {workflows / elapsed:9.0f} updates/s  {flushes} commits")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Write-behind status writer benchmark")
+    parser.add_argument("--workflows", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    seed(args.workflows)
+    asyncio.run(measure(args.workflows, args.concurrency))
+
+
+if __name__ == "__main__":
+    run()
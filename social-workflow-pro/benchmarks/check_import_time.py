@@ -0,0 +1,103 @@
+"""
+Cold-start import budget for the API process.
+
+Imports `app.main` in fresh interpreters under `python -X importtime` and
+fails (exit status 1) when the best of `--runs` cumulative import times
+exceeds `--budget-ms`, or when importing the app and the service modules
+loads any of the libraries that must only be imported on first use (spaCy,
+scikit-learn, pandas, OpenCV, ReportLab). Meant to run in CI:
+
+    python benchmarks/check_import_time.py --budget-ms 1500
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported inside the code paths that need them; none may load at startup
+LAZY_MODULES = ("spacy", "sklearn", "pandas", "cv2", "reportlab")
+DEFAULT_BUDGET_MS = 1500
+
+
+def interpreter(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/import_check.db")
+    return subprocess.run(
+        [sys.executable, *options, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in microseconds of every module loaded by `import module`"""
+    result = interpreter(f"import {module}", "-X", "importtime")
+    if result.returncode:
+        sys.exit(f"importing {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def eagerly_loaded(modules: list) -> tuple:
+    """
+    Which LAZY_MODULES are in sys.modules after importing `modules`, and which
+    of `modules` were skipped because a dependency of theirs is not installed.
+    """
+    code = (
+        "import importlib, json, sys\n"
+        "skipped = []\n"
+        f"for name in {modules!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "    except ModuleNotFoundError as e:\n"
+        "        skipped.append(f'{name} ({e.name})')\n"
+        f"loaded = {{m.split('.')[0] for m in sys.modules}} & set({list(LAZY_MODULES)!r})\n"
+        "print(json.dumps([sorted(loaded), skipped]))"
+    )
+    result = interpreter(code)
+    if result.returncode:
+        sys.exit(f"importing the app failed:\n{result.stderr}")
+    return tuple(json.loads(result.stdout))
+
+
+def service_modules() -> list:
+    paths = sorted(glob.glob(os.path.join(ROOT, "app", "services", "*.py")))
+    return [f"app.services.{os.path.splitext(os.path.basename(path))[0]}" for path in paths]
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start import time budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [import_times("app.main") for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times["app.main"])
+    total_ms = best["app.main"] / 1000
+    print(f"import app.main: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    for name, micros in sorted(best.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"app.main took {total_ms:.0f} ms to import, over the {args.budget_ms:.0f} ms budget")
+    loaded, skipped = eagerly_loaded(["app.main", *service_modules()])
+    if skipped:
+        print(f"not checked, missing a dependency: {', '.join(skipped)}")
+    if loaded:
+        failures.append(f"imported at startup instead of on first use: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,87 @@
+"""
+Local stand-in for the social platform publishing APIs.
+
+Accepts POST /<platform>/posts with a fixed latency and an optional failure
+rate, and records per-platform request counts, peak concurrency and peak
+requests per second (GET /stats). Point PLATFORM_API_URLS at it:
+
+    python benchmarks/fake_platform.py --port 8089 --latency-ms 50
+    PLATFORM_API_URLS='{"facebook": "http://127.0.0.1:8089/facebook"}' uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+
+from aiohttp import web
+
+
+class PlatformStats:
+    def __init__(self):
+        self.requests = Counter()
+        self.failures = Counter()
+        self.in_flight = Counter()
+        self.peak_in_flight = Counter()
+        self.per_second = defaultdict(Counter)
+
+    def snapshot(self) -> dict:
+        return {
+            platform: {
+                "requests": self.requests[platform],
+                "failures": self.failures[platform],
+                "peak_in_flight": self.peak_in_flight[platform],
+                "peak_per_second": max(self.per_second[platform].values(), default=0),
+            }
+            for platform in self.requests
+        }
+
+
+def make_app(latency: float, failure_rate: float, stats: PlatformStats) -> web.Application:
+    async def create_post(request: web.Request) -> web.Response:
+        platform = request.match_info["platform"]
+        stats.requests[platform] += 1
+        stats.per_second[platform][int(time.monotonic())] += 1
+        stats.in_flight[platform] += 1
+        stats.peak_in_flight[platform] = max(stats.peak_in_flight[platform], stats.in_flight[platform])
+        try:
+            await request.read()
+            await asyncio.sleep(latency)
+            if random.random() < failure_rate:
+                stats.failures[platform] += 1
+                return web.json_response({"error": "upstream unavailable"}, status=503)
+            return web.json_response({"id": stats.requests[platform]}, status=201)
+        finally:
+            stats.in_flight[platform] -= 1
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats.snapshot())
+
+    app = web.Application()
+    app.router.add_post("/{platform}/posts", create_post)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start(port: int, latency: float, failure_rate: float = 0.0):
+    """Serve in the running loop; returns (runner, stats)"""
+    stats = PlatformStats()
+    runner = web.AppRunner(make_app(latency, failure_rate, stats), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, stats
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Fake social platform API")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stats = PlatformStats()
+    web.run_app(make_app(args.latency_ms / 1000, args.failure_rate, stats), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    run()
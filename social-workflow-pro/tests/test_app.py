@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+from sqlalchemy import select
+
+from app.db.migrations import MIGRATIONS, schema_migrations
+from app.db.session import async_engine
+from app.main import app
+from app.utils.scheduler import dispatcher
+from app.utils.status_writer import status_writer
+
+
+def test_app_starts_and_stops_through_its_lifespan():
+    async def scenario():
+        async with app.router.lifespan_context(app):
+            running = dispatcher._task is not None and status_writer._task is not None
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                root = await client.get("/")
+                campaign = await client.post("/api/v1/campaigns/", json={
+                    "name": "lifespan test",
+                    "status": "active",
+                    "start_date": "2030-01-01T00:00:00",
+                    "end_date": "2030-02-01T00:00:00",
+                })
+            async with async_engine.connect() as connection:
+                applied = set(await connection.scalars(select(schema_migrations.c.version)))
+        stopped = dispatcher._task is None and status_writer._task is None
+        await async_engine.dispose()
+        return running, stopped, root, campaign, applied
+
+    running, stopped, root, campaign, applied = asyncio.run(scenario())
+    assert running and stopped
+    assert root.status_code == 200
+    assert campaign.status_code == 200
+    assert applied == {version for version, _ in MIGRATIONS}
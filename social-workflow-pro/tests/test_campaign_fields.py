@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+
+from app.db.migrations import run_migrations
+from app.db.session import async_engine
+from app.main import app
+
+CAMPAIGN = {
+    "name": "fields test",
+    "status": "active",
+    "start_date": "2030-01-01T00:00:00",
+    "end_date": "2030-02-01T00:00:00",
+}
+
+
+async def get_campaign(path: str, params: dict) -> dict:
+    await run_migrations()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        campaign = (await client.post("/api/v1/campaigns/", json=CAMPAIGN)).json()
+        response = await client.get(path.format(id=campaign["id"]), params=params)
+    await async_engine.dispose()
+    response.raise_for_status()
+    return response.json()
+
+
+def test_sparse_campaign_counts_workflows_by_default():
+    body = asyncio.run(get_campaign("/api/v1/campaigns/{id}", {"fields": "name"}))
+    assert set(body) == {"id", "name", "workflow_counts"}
+
+
+def test_sparse_campaign_nests_workflows_when_asked():
+    body = asyncio.run(get_campaign("/api/v1/campaigns/{id}", {"fields": "name", "include_workflows": "full"}))
+    assert set(body) == {"id", "name", "workflows"}
+
+
+def test_full_campaign_still_nests_workflows():
+    body = asyncio.run(get_campaign("/api/v1/campaigns/{id}", {}))
+    assert "workflows" in body and "workflow_counts" not in body
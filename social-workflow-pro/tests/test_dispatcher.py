@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime
+
+from app.utils import scheduler
+from app.utils.scheduler import PublishDispatcher
+
+
+def test_publish_error_is_retried_after_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(scheduler, "retry_delay", lambda attempt: delays.append(attempt) or 0)
+
+    async def scenario():
+        calls = []
+
+        async def publish(workflow_id):
+            calls.append(workflow_id)
+            if len(calls) < 3:
+                raise ConnectionError("database is unavailable")
+            return None
+
+        dispatcher = PublishDispatcher(publish=publish, max_in_flight=1)
+        monkeypatch.setattr(dispatcher, "recover", lambda: asyncio.sleep(0, 0))
+        await dispatcher.start()
+        dispatcher.schedule(7, datetime.utcnow())
+        for _ in range(100):
+            if len(calls) == 3 and not dispatcher._in_flight:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+        return calls, dispatcher
+
+    calls, dispatcher = asyncio.run(scenario())
+    assert calls == [7, 7, 7]
+    # Backoff grows with each error in a row, and success clears the count
+    assert delays == [1, 2]
+    assert 7 not in dispatcher
+    assert dispatcher._errors == {}
+
+
+def test_failed_publish_waits_in_heap_until_cancelled(monkeypatch):
+    monkeypatch.setattr(scheduler, "retry_delay", lambda attempt: 60)
+
+    async def scenario():
+        async def publish(workflow_id):
+            raise ConnectionError("database is unavailable")
+
+        dispatcher = PublishDispatcher(publish=publish, max_in_flight=1)
+        monkeypatch.setattr(dispatcher, "recover", lambda: asyncio.sleep(0, 0))
+        await dispatcher.start()
+        dispatcher.schedule(7, datetime.utcnow())
+        for _ in range(100):
+            if 7 in dispatcher:
+                break
+            await asyncio.sleep(0.01)
+        retried = 7 in dispatcher
+        dispatcher.cancel(7)
+        await dispatcher.stop()
+        return retried, dispatcher
+
+    retried, dispatcher = asyncio.run(scenario())
+    assert retried
+    assert 7 not in dispatcher
+    assert dispatcher._errors == {}
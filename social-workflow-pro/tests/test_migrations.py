@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine, inspect
+
+from app.db.migrations import MIGRATIONS, migrate
+from app.models.base import Base
+from app.models import workflow  # noqa: F401  (registers every table on Base.metadata)
+
+
+def layout(engine) -> dict:
+    """Tables with their columns (name, nullable), index columns and unique constraints"""
+    inspector = inspect(engine)
+    return {
+        table: (
+            {(column["name"], column["nullable"]) for column in inspector.get_columns(table)},
+            {(index["name"], tuple(index["column_names"])) for index in inspector.get_indexes(table)},
+            {tuple(unique["column_names"]) for unique in inspector.get_unique_constraints(table)},
+        )
+        for table in inspector.get_table_names() if table != "schema_migrations"
+    }
+
+
+def test_migrations_build_the_model_schema():
+    migrated = create_engine("sqlite://")
+    with migrated.begin() as connection:
+        assert migrate(connection) == [version for version, _ in MIGRATIONS]
+        assert migrate(connection) == []
+
+    expected = create_engine("sqlite://")
+    Base.metadata.create_all(expected)
+    assert layout(migrated) == layout(expected)
+
+
+def test_databases_from_create_all_adopt_the_history():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    before = layout(engine)
+    with engine.begin() as connection:
+        migrate(connection)
+    assert layout(engine) == before
+
+
+def test_scheduled_jobs_gain_the_attempts_column():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for version, step in MIGRATIONS[:3]:
+            step(connection)
+    assert "attempts" not in {column["name"] for column in inspect(engine).get_columns("scheduled_jobs")}
+
+    with engine.begin() as connection:
+        migrate(connection)
+    assert "attempts" in {column["name"] for column in inspect(engine).get_columns("scheduled_jobs")}
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.db.migrations import run_migrations
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.workflow import Campaign, PublishAttempt, ScheduledJob, Workflow
+from app.utils import scheduler
+from app.utils.status_writer import status_writer
+
+
+async def seed_due_workflow() -> int:
+    await run_migrations()
+    async with AsyncSessionLocal() as db:
+        workflow = Workflow(
+            campaign=Campaign(name="publish test", status="active"),
+            content_type="post",
+            status="scheduled",
+            platform="facebook",
+            content={"text": "Fresh pasta night"},
+            schedule_time=datetime.utcnow() - timedelta(seconds=1),
+            meta={},
+        )
+        db.add(workflow)
+        await db.flush()
+        db.add(ScheduledJob(workflow_id=workflow.id, run_at=workflow.schedule_time))
+        await db.commit()
+        return workflow.id
+
+
+def test_no_connection_is_held_while_publishing(monkeypatch):
+    checked_out = []
+
+    async def publish_content(platform, content, key):
+        checked_out.append(async_engine.pool.checkedout())
+        return True
+
+    monkeypatch.setattr(scheduler, "publish_content", publish_content)
+
+    async def scenario():
+        workflow_id = await seed_due_workflow()
+        result = await scheduler.publish_scheduled(workflow_id)
+        await status_writer.flush()
+        async with AsyncSessionLocal() as db:
+            job = await db.scalar(select(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+            status = await db.scalar(select(Workflow.status).where(Workflow.id == workflow_id))
+        await async_engine.dispose()
+        return result, job, status
+
+    result, job, status = asyncio.run(scenario())
+    assert checked_out == [0]
+    assert result is None
+    assert job is None
+    assert status == "published"
+
+
+def test_retryable_failure_moves_the_job_in_a_new_session(monkeypatch):
+    async def publish_content(platform, content, key):
+        raise ConnectionError("platform timed out")
+
+    monkeypatch.setattr(scheduler, "publish_content", publish_content)
+
+    async def scenario():
+        workflow_id = await seed_due_workflow()
+        retry_at = await scheduler.publish_scheduled(workflow_id)
+        async with AsyncSessionLocal() as db:
+            job = await db.scalar(select(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+            attempts = (await db.scalars(
+                select(PublishAttempt).where(PublishAttempt.workflow_id == workflow_id)
+            )).all()
+        await async_engine.dispose()
+        return retry_at, job, attempts
+
+    retry_at, job, attempts = asyncio.run(scenario())
+    assert retry_at is not None
+    assert (job.run_at, job.attempts) == (retry_at, 1)
+    assert [(a.attempt, a.succeeded) for a in attempts] == [(1, False)]
+
+
+def test_publish_reporting_false_is_retried_not_published(monkeypatch):
+    async def publish_content(platform, content, key):
+        return False
+
+    monkeypatch.setattr(scheduler, "publish_content", publish_content)
+
+    async def scenario():
+        workflow_id = await seed_due_workflow()
+        retry_at = await scheduler.publish_scheduled(workflow_id)
+        await status_writer.flush()
+        async with AsyncSessionLocal() as db:
+            job = await db.scalar(select(ScheduledJob).where(ScheduledJob.workflow_id == workflow_id))
+            status = await db.scalar(select(Workflow.status).where(Workflow.id == workflow_id))
+        await async_engine.dispose()
+        return retry_at, job, status
+
+    retry_at, job, status = asyncio.run(scenario())
+    assert retry_at is not None
+    assert job.attempts == 1
+    assert status == "scheduled"
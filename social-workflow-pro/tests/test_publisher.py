@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from app.utils import publisher
+from app.utils.publisher import PublishError, PublisherPool
+
+
+def test_platform_without_a_publisher_is_a_permanent_failure():
+    pool = PublisherPool(api_urls={})
+    with pytest.raises(PublishError) as error:
+        asyncio.run(pool.publish("myspace", {"text": "hello"}))
+    assert not error.value.retryable
+
+
+def test_stub_reporting_failure_raises_a_retryable_error(monkeypatch):
+    async def failing_stub(content):
+        return False
+
+    monkeypatch.setitem(publisher.PLATFORM_STUBS, "facebook", failing_stub)
+    pool = PublisherPool(api_urls={})
+    with pytest.raises(PublishError) as error:
+        asyncio.run(pool.publish("facebook", {"text": "hello"}))
+    assert error.value.retryable
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models.workflow import ScheduledJob, Workflow
+from app.utils import scheduler
+
+CAMPAIGN = {
+    "name": "scheduling test",
+    "status": "active",
+    "start_date": "2030-01-01T00:00:00",
+    "end_date": "2030-02-01T00:00:00",
+}
+
+
+def workflow_payload(campaign_id: int, delay: timedelta) -> dict:
+    return {
+        "campaign_id": campaign_id,
+        "content_type": "post",
+        "platform": "facebook",
+        "content": {"text": "Fresh pasta night is back"},
+        "schedule_time": (datetime.utcnow() + delay).isoformat(),
+    }
+
+
+async def wait_until_published(workflow_ids: list) -> tuple:
+    """Poll until every workflow is published or a few seconds pass; returns (statuses, job rows left)"""
+    for _ in range(40):
+        async with AsyncSessionLocal() as db:
+            statuses = list(await db.scalars(select(Workflow.status).where(Workflow.id.in_(workflow_ids))))
+            jobs = list(await db.scalars(select(ScheduledJob.workflow_id).where(ScheduledJob.workflow_id.in_(workflow_ids))))
+        if not jobs and all(status == "published" for status in statuses):
+            break
+        await asyncio.sleep(0.05)
+    return statuses, jobs
+
+
+def run_against_app(monkeypatch, create) -> tuple:
+    async def publish_content(platform, content, key):
+        return True
+
+    # Slow commits so posts fall due before the creating transaction lands
+    commit = AsyncSession.commit
+
+    async def slow_commit(self):
+        await asyncio.sleep(0.2)
+        await commit(self)
+
+    monkeypatch.setattr(scheduler, "publish_content", publish_content)
+    monkeypatch.setattr(AsyncSession, "commit", slow_commit)
+
+    async def scenario():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                campaign = (await client.post("/api/v1/campaigns/", json=CAMPAIGN)).json()
+                workflow_ids = await create(client, campaign["id"])
+            result = await wait_until_published(workflow_ids)
+        await async_engine.dispose()
+        return result
+
+    return asyncio.run(scenario())
+
+
+def test_workflow_due_right_away_is_published(monkeypatch):
+    async def create(client, campaign_id):
+        response = await client.post(
+            "/api/v1/workflows/", json=workflow_payload(campaign_id, timedelta(milliseconds=100))
+        )
+        response.raise_for_status()
+        return [response.json()["id"]]
+
+    statuses, jobs = run_against_app(monkeypatch, create)
+    assert statuses == ["published"]
+    assert jobs == []
+
+
+def test_bulk_workflows_due_right_away_are_published(monkeypatch):
+    async def create(client, campaign_id):
+        response = await client.post("/api/v1/workflows/bulk", json={"workflows": [
+            workflow_payload(campaign_id, timedelta(milliseconds=100 + i)) for i in range(5)
+        ]})
+        response.raise_for_status()
+        return [item["id"] for item in response.json()["results"]]
+
+    statuses, jobs = run_against_app(monkeypatch, create)
+    assert statuses == ["published"] * 5
+    assert jobs == []
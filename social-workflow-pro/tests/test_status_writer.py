@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from app.utils.status_writer import StatusWriter
+
+
+def test_failed_flush_does_not_bring_back_discarded_statuses(monkeypatch):
+    writer = StatusWriter(flush_interval=60, max_pending=1000)
+    writer.update(1, "published")
+    writer.update(2, "dead_letter", {"error": "timed out"})
+    writer.record_attempt(workflow_id=3, idempotency_key="3:k", attempt=1, succeeded=False)
+
+    async def failing_write(db, statuses):
+        # A user edits workflow 1 and deletes workflow 3 while the batch is being written
+        writer.discard(1)
+        writer.discard(3, attempts=True)
+        raise ConnectionError("database is locked")
+
+    monkeypatch.setattr(StatusWriter, "_write_statuses", staticmethod(failing_write))
+    with pytest.raises(ConnectionError):
+        asyncio.run(writer.flush())
+
+    assert set(writer._statuses) == {2}
+    assert writer._statuses[2].status == "dead_letter"
+    assert writer._attempts == []
@@ -0,0 +1,9 @@
+from app.services.viral_content_generator import ViralContentGenerator
+
+
+def test_unknown_industry_yields_an_empty_series():
+    generator = ViralContentGenerator()
+    assert generator.generate_content_series("underwater basket weaving", "launch", 5, seed=7) == []
+    assert generator.generate_content_series("underwater basket weaving", "launch", 5) == []
+    assert generator.generate_viral_content("underwater basket weaving", "launch", "value", seed=7) == []
+